@@ -0,0 +1,295 @@
+# advice.py
+# 현실적 조언 마법사(mine.py) 라우팅/조언
+# 예전 route_and_reply 는 카테고리마다 any(word in text ...) 를 차례로 돌려서
+#  - 비용이 카테고리 수 × 키워드 수 × 글 길이로 늘고
+#  - if/elif 순서가 곧 우선순위라 "점"(점심, 점수…) 같은 짧은 키워드가 먼저 걸리면 끝이었다.
+# 여기서는 키워드 전체를 Aho-Corasick 자동자로 한 번 만들어 두고 글을 한 번만 훑어서
+# 걸린 키워드를 카테고리별로 점수(키워드 길이 합)를 매겨 가장 높은 카테고리를 고른다.
+# 점수가 같으면 priority 가 큰 쪽, 그것도 같으면 파일에서 앞선 쪽.
+# 매칭 전에 글을 정규화한다 (NFKC, 소문자, 띄어쓰기/문장부호, 조사 떼기 — normalize, 결과는 LRU 캐시).
+# 한 글자 키워드는 토큰 단위로만 비교해서 "비밀"의 "비", "점심"의 "점" 같은 오탐을 막는다.
+#
+# 규칙은 advice_rules.json 에 있다 (코드 수정 없이 카테고리 추가):
+#   {"unknown": "...", "rules": [{"category": "fashion", "priority": 30,
+#     "keywords": [...], "responses": [...],
+#     "branches": [{"keywords": ["청바지"], "responses": [...]}]}]}
+#  - responses 가 여러 개면 그중 하나를 무작위로
+#  - branches 는 위에서부터 키워드가 글에 들어 있는 첫 번째 것의 responses 를 씀
+#  - 키워드 끝에 * 를 붙이면 그걸로 시작하는 낱말 ("늦*" → 늦었어, 늦잠)
+#  - "daily": true 면 사용자·날짜별로 고정된 답 (오늘의 운세)
+# current_rules() 는 파일의 mtime/크기가 바뀌었을 때만 다시 읽고 자동자를 새로 만든다.
+# 고친 파일이 깨져 있으면 경고만 남기고 직전에 읽은 규칙을 계속 쓴다.
+import json
+import os
+import random
+import re
+import threading
+import unicodedata
+import warnings
+from collections import deque
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+RULES_PATH = Path(__file__).with_name("advice_rules.json")
+ROUTE_CACHE_SIZE = 4096
+
+UNKNOWN = "마법사가 그 고민은 아직 잘 모르겠어. 조금 더 구체적으로 말해줘!"
+
+# =========================
+# ---- Aho-Corasick -------
+# =========================
+class KeywordMatcher:
+    # 키워드 → 값 목록. find(text) 는 글을 한 글자씩 한 번만 지나가며 걸린 (키워드, 값) 을 돌려준다
+    def __init__(self, keywords: dict[str, list]):
+        self.goto = [{}]   # 상태 → {글자: 다음 상태}
+        self.fail = [0]
+        self.out = [[]]    # 상태 → 여기서 끝나는 (키워드, 값) 목록 (fail 쪽 것까지 합쳐 둠)
+        for word, values in keywords.items():
+            state = 0
+            for ch in word:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].extend((word, v) for v in values)
+        # BFS 로 fail 링크
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text: str) -> list[tuple[str, object]]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        hits = []
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                hits.extend(out[state])
+        return hits
+
+# =========================
+# ---- 정규화 ------------
+# =========================
+# 토큰 끝의 조사 (긴 것부터). 한 글자 키워드("비", "옷", "점")를 토큰 단위로 비교할 때만 쓴다
+PARTICLES = sorted(["은", "는", "이", "가", "을", "를", "에", "도", "만", "와", "과", "랑", "의", "로",
+                    "에서", "에게", "한테", "으로", "까지", "부터", "처럼", "보다", "이랑", "이나",
+                    "에서는", "에게서", "으로는"], key=len, reverse=True)
+
+def strip_particle(token: str) -> str:
+    for p in PARTICLES:
+        if len(token) > len(p) and token.endswith(p):
+            return token[:-len(p)]
+    return token
+
+def _normalize(text: str) -> tuple[str, tuple[str, ...]]:
+    # → (소문자 + 띄어쓰기 한 칸으로 맞춘 글, 조사를 뗀 토큰들)
+    # NFKC: 따로 친 자모(ㅂㅣ)를 음절(비)로 합치고 전각 문자(ＡＢＣ！)를 보통 문자로
+    words = re.findall(r"\w+", unicodedata.normalize("NFKC", text).lower())
+    return " ".join(words), tuple(strip_particle(w) for w in words)
+
+# 들어오는 질문용 (같은 질문이 반복되면 다시 계산 안 함). 키워드 컴파일은 캐시를 안 거침
+normalize = lru_cache(maxsize=4096)(_normalize)
+
+# =========================
+# ---- 키워드 색인 --------
+# =========================
+class KeywordIndex:
+    # 키워드 종류별로 찾는 방법이 다르다
+    #  - 두 글자 이상  : 정규화한 글에서 부분 문자열 (Aho-Corasick 한 번 훑기)
+    #                   띄어쓰기가 든 키워드("좋아하는 사람")는 붙여 쓴 것("좋아하는사람")도 같이 등록
+    #  - 한 글자       : 조사를 뗀 토큰과 같을 때만 ("비가 와" O, "비밀" X)
+    #  - "늦*" 처럼 * 로 끝나면 : 토큰이 그걸로 시작할 때 ("늦었어", "늦잠")
+    # find(text) 는 걸린 (키워드, 카테고리) 집합. 이미 정규화했으면 find_normalized
+    def __init__(self, keywords: dict[str, list[str]]):
+        substrings, self.tokens, self.prefixes = {}, {}, {}
+        for keyword, categories in keywords.items():
+            values = [(keyword, c) for c in categories]
+            word = _normalize(keyword)[0]
+            if keyword.endswith("*"):
+                self.prefixes.setdefault(word, []).extend(values)
+            elif len(word) == 1:
+                self.tokens.setdefault(word, []).extend(values)
+            else:
+                for variant in {word, word.replace(" ", "")}:
+                    substrings.setdefault(variant, []).extend(values)
+        self.matcher = KeywordMatcher(substrings)
+        self.prefix_lengths = sorted({len(w) for w in self.prefixes})
+
+    def find(self, text: str) -> set[tuple[str, str]]:
+        return self.find_normalized(normalize(text))
+
+    def find_normalized(self, normalized: tuple[str, tuple[str, ...]]) -> set[tuple[str, str]]:
+        spaced, stems = normalized
+        hits = {value for _word, value in self.matcher.find(spaced)}
+        for stem in stems:
+            hits.update(self.tokens.get(stem, ()))
+            for n in self.prefix_lengths:
+                hits.update(self.prefixes.get(stem[:n], ()))
+        return hits
+
+def build_matcher(rules: list[dict]) -> KeywordIndex:
+    keywords = {}
+    for rule in rules:
+        for word in rule["keywords"]:
+            keywords.setdefault(word, []).append(rule["category"])
+    return KeywordIndex(keywords)
+
+def _scores(hits: set[tuple[str, str]]) -> dict[str, int]:
+    # 카테고리 → 걸린 (서로 다른) 키워드 길이 합. 긴 키워드일수록 구체적이라 점수가 큼
+    scores = {}
+    for keyword, category in hits:
+        scores[category] = scores.get(category, 0) + len(keyword.rstrip("*").replace(" ", ""))
+    return scores
+
+# =========================
+# ---- 오늘의 운세 --------
+# =========================
+# "daily": true 인 규칙(운세)은 (사용자, 날짜, 카테고리)로 시드를 정해 고른다
+# → 같은 사람은 하루 동안 같은 답, 날이 바뀌면 새로. 문자열 시드라 프로세스가 달라도 같다
+@lru_cache(maxsize=1024)
+def daily_choice(user: str, day: str, category: str, responses: tuple[str, ...]) -> str:
+    return random.Random(f"{user}|{day}|{category}").choice(responses)
+
+# =========================
+# ---- 규칙 표 -----------
+# =========================
+def _check_rules(raw: dict) -> list[dict]:
+    rules = raw.get("rules")
+    if not isinstance(rules, list):
+        raise ValueError('"rules" 는 리스트여야 해요')
+    seen = set()
+    for i, rule in enumerate(rules):
+        where = f"rules[{i}]"
+        category = rule.get("category")
+        if not isinstance(category, str) or not category:
+            raise ValueError(f"{where}: category 가 없어요")
+        if category in seen:
+            raise ValueError(f"{where}: category {category!r} 가 중복이에요")
+        seen.add(category)
+        for part, sub in [(where, rule), *((f"{where}.branches[{j}]", b)
+                                          for j, b in enumerate(rule.get("branches", [])))]:
+            words = sub.get("keywords")
+            if not isinstance(words, list) or not words or not all(isinstance(w, str) and w for w in words):
+                raise ValueError(f"{part}: keywords 는 빈 문자열이 아닌 문자열 리스트여야 해요")
+            for word in words:
+                # 문장부호/공백만 있는 키워드("!!", "*")는 정규화하면 "" → 모든 글에 걸려버림
+                if not _normalize(word)[0]:
+                    raise ValueError(f"{part}: 키워드 {word!r} 에 글자나 숫자가 없어요")
+            responses = sub.get("responses")
+            if not isinstance(responses, list) or not responses or not all(isinstance(r, str) for r in responses):
+                raise ValueError(f"{part}: responses 는 문자열 리스트여야 해요")
+        if not isinstance(rule.get("priority", 0), (int, float)):
+            raise ValueError(f"{where}: priority 는 숫자여야 해요")
+        if not isinstance(rule.get("daily", False), bool):
+            raise ValueError(f"{where}: daily 는 true/false 여야 해요")
+    return rules
+
+class RuleBook:
+    # 규칙 표 하나를 미리 컴파일한 것 (키워드 색인 + 카테고리별 규칙 + 동점 순위)
+    # 정규화한 질문 → 카테고리는 LRU 캐시 (cache_info 로 적중률). 규칙 파일이 바뀌면
+    # RuleBook 이 새로 만들어지니 캐시도 같이 새로 시작한다
+    def __init__(self, rules: list[dict], unknown: str = UNKNOWN, rng: random.Random | None = None):
+        self.rules = {rule["category"]: rule for rule in rules}
+        order = sorted(range(len(rules)), key=lambda i: (-rules[i].get("priority", 0), i))
+        self.rank = {rules[i]["category"]: n for n, i in enumerate(order)}
+        self.matcher = build_matcher(rules)
+        self.unknown = unknown
+        self.rng = rng or random.Random()
+        self._route = lru_cache(maxsize=ROUTE_CACHE_SIZE)(self._route_normalized)
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "RuleBook":
+        return cls(_check_rules(raw), raw.get("unknown") or UNKNOWN)
+
+    def _route_normalized(self, normalized: tuple[str, tuple[str, ...]]) -> str | None:
+        scores = _scores(self.matcher.find_normalized(normalized))
+        if not scores:
+            return None
+        return max(scores, key=lambda c: (scores[c], -self.rank[c]))
+
+    def route(self, text: str) -> str | None:
+        return self._route(normalize(text))
+
+    def cache_info(self) -> dict:
+        info = self._route.cache_info()
+        total = info.hits + info.misses
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize,
+                "hit_rate": info.hits / total if total else 0.0}
+
+    def cache_clear(self):
+        self._route.cache_clear()
+
+    def respond(self, category: str, text: str, user: str = "", day: date | str | None = None) -> str:
+        rule = self.rules[category]
+        compact = normalize(text)[0].replace(" ", "")
+        responses = rule["responses"]
+        for branch in rule.get("branches", []):
+            if any(_normalize(word)[0].replace(" ", "") in compact for word in branch["keywords"]):
+                responses = branch["responses"]
+                break
+        if rule.get("daily"):
+            day = day or date.today()
+            return daily_choice(user, day if isinstance(day, str) else day.isoformat(), category, tuple(responses))
+        return self.rng.choice(responses)
+
+    def reply(self, text: str, user: str = "", day: date | str | None = None) -> str:
+        category = self.route(text)
+        if category is None:
+            return self.unknown
+        return self.respond(category, text, user, day)
+
+EMPTY = RuleBook([])
+
+_lock = threading.Lock()
+_loaded = {}  # 경로 → (stamp, RuleBook)
+
+def current_rules(path: Path | str = RULES_PATH) -> RuleBook:
+    # 요청마다 stat 한 번. 파일이 그대로면 컴파일해 둔 RuleBook 을 그대로 돌려줌
+    path = Path(path)
+    try:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        stamp = None
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        book = cached[1] if cached is not None else EMPTY
+        try:
+            if stamp is None:
+                raise FileNotFoundError(f"{path} 가 없어요")
+            book = RuleBook.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as e:
+            # 같은 stamp 에 대해서는 한 번만 경고 (다음 요청부터는 직전 규칙 그대로)
+            warnings.warn(f"조언 규칙을 읽지 못해서 이전 규칙을 계속 써요: {e}")
+        _loaded[path] = (stamp, book)
+        return book
+
+def route(text: str) -> str | None:
+    return current_rules().route(text)
+
+def route_and_reply(text: str, user: str = "", day: date | str | None = None) -> str:
+    return current_rules().reply(text, user, day)
+
+def cache_stats(path: Path | str = RULES_PATH) -> dict:
+    # 지금 규칙의 라우팅 캐시 + 정규화 캐시 적중 수
+    info = normalize.cache_info()
+    total = info.hits + info.misses
+    return {"route": current_rules(path).cache_info(),
+            "normalize": {"hits": info.hits, "misses": info.misses, "size": info.currsize,
+                          "hit_rate": info.hits / total if total else 0.0}}
@@ -0,0 +1,214 @@
+# advice_batch.py
+# mine.py 조언 라우팅을 UI 없이 대량으로 돌리기 (오프라인 평가용)
+#   python advice_batch.py questions.jsonl -o answers.jsonl --workers 4
+# 입력 JSONL 한 줄: {"id": ..., "text": "고민", "label": "food", "user": "민지", "date": "2026-10-17"}
+#   (text 말고는 없어도 됨, "question" 키도 받음. user/date 는 오늘의 운세 시드 — 없으면 "" / 오늘)
+#   text/user 가 숫자면 문자열로 바꾸고, 리스트·dict 거나 date 가 YYYY-MM-DD 가 아니면 그 줄은 건너뜀 (stderr)
+# 출력 JSONL 한 줄: {"id", "text", "category", "answer", "latency_ms"} (+ label 이 있었으면 "label")
+# - 파일은 한 줄씩 읽고 CHUNK_LINES 줄씩 묶어 프로세스 풀에 보낸다 (JSON 파싱/직렬화도 워커에서).
+#   한꺼번에 떠 있는 묶음은 workers × 2 개까지라 100만 줄이어도 메모리는 묶음 크기만큼만 쓴다.
+# - 결과는 입력 순서대로, 묶음이 끝나는 대로 바로 파일에 쓴다.
+# - 다른 코드에서는 answer_many(레코드들) 로 같은 파이프라인을 쓸 수 있다.
+# - label 이 있는 줄이 있으면 정확도(category == label, 못 찾은 건 "unknown")도 낸다.
+# - 지연 p50/p99 는 LATENCY_SAMPLE 개짜리 무작위 표본에서 (평균/최대는 전체 기준)
+import argparse
+import json
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import advice
+
+CHUNK_LINES = 1000
+NO_CATEGORY = "unknown"
+LATENCY_SAMPLE = 10_000
+
+# =========================
+# ---- 라우팅 ------------
+# =========================
+def _as_text(record: dict, key: str, value) -> str:
+    # None → "", 숫자 → 문자열. 그 밖의 것(리스트, dict, true/false)은 잘못된 줄
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError(f"{key} 가 문자열이 아니에요 ({type(value).__name__})")
+
+def _fields(record: dict) -> tuple[str, str, str | None]:
+    # → (text, user, date). 고칠 수 없는 값이면 ValueError
+    text = _as_text(record, "text", record.get("text", record.get("question")))
+    user = _as_text(record, "user", record.get("user"))
+    day = record.get("date")
+    if day is not None:
+        if not isinstance(day, str):
+            raise ValueError(f"date 가 문자열이 아니에요 ({type(day).__name__})")
+        try:
+            day = date.fromisoformat(day).isoformat()
+        except ValueError:
+            raise ValueError(f"date 가 YYYY-MM-DD 가 아니에요 ({day!r})") from None
+    return text, user, day
+
+def answer(record: dict, book: advice.RuleBook) -> dict:
+    # 잘못된 레코드면 ValueError
+    text, user, day = _fields(record)
+    t = time.perf_counter()
+    category = book.route(text)
+    if category is None:
+        reply = book.unknown
+    else:
+        reply = book.respond(category, text, user, day)
+    out = {"id": record.get("id"), "text": text, "category": category or NO_CATEGORY, "answer": reply,
+           "latency_ms": round((time.perf_counter() - t) * 1000, 4)}
+    if "label" in record:
+        out["label"] = record["label"]
+    return out
+
+def _answer_chunk(records: list[dict], rules_path: str) -> list[dict]:
+    # 워커 프로세스에서 실행. 규칙은 프로세스마다 한 번 컴파일 (파일이 바뀌면 다시)
+    book = advice.current_rules(rules_path)
+    return [answer(r, book) for r in records]
+
+def _pipeline(items: Iterable, fn, workers: int, chunk_lines: int, *args) -> Iterator:
+    # items 를 chunk_lines 개씩 묶어 fn(묶음, *args) 결과를 입력 순서대로 돌려줌
+    # workers=0 이면 현재 프로세스에서 바로 (작은 입력/디버깅용)
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunk_lines)), [])
+    if workers <= 0:
+        for chunk in chunks:
+            yield fn(chunk, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(fn, chunk, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def answer_many(records: Iterable[dict], workers: int = 0, chunk_lines: int = CHUNK_LINES,
+                rules_path: Path | str = advice.RULES_PATH) -> Iterator[dict]:
+    # records 를 입력 순서대로 답한 결과를 하나씩 돌려주는 제너레이터
+    for outs in _pipeline(records, _answer_chunk, workers, chunk_lines, str(rules_path)):
+        yield from outs
+
+# =========================
+# ---- 파일 --------------
+# =========================
+def _parse(line: str) -> dict:
+    # 문자열만 있는 줄은 {"text": ...} 로
+    record = json.loads(line)
+    return record if isinstance(record, dict) else {"text": str(record)}
+
+def _answer_lines(lines: list[tuple[int, str]], rules_path: str) -> tuple[str, list, list[tuple[int, str]]]:
+    # 파일용 워커: JSON 파싱/직렬화까지 워커에서 해서 메인 프로세스는 쓰기만
+    # → (출력 텍스트, [(지연, 답함, 정답 여부 또는 None)], [(건너뛴 줄 번호, 이유)])
+    # 한 줄이 잘못돼도 묶음 전체가 죽지 않게 줄마다 잡는다
+    book = advice.current_rules(rules_path)
+    text, rows, bad = [], [], []
+    for n, line in lines:
+        try:
+            record = _parse(line)
+        except ValueError:
+            bad.append((n, "JSON 이 아니에요"))
+            continue
+        try:
+            out = answer(record, book)
+        except (ValueError, TypeError) as e:
+            bad.append((n, str(e)))
+            continue
+        text.append(json.dumps(out, ensure_ascii=False) + "\n")
+        label = out.get("label")
+        rows.append((out["latency_ms"], out["category"] != NO_CATEGORY,
+                     None if label is None else out["category"] == label))
+    return "".join(text), rows, bad
+
+class LatencyStats:
+    # 지연 통계를 고정 크기 메모리로: 평균/최대는 정확히, 분위수는 저수지 표본(Algorithm R)에서
+    # 줄 수가 size 이하면 표본 = 전체라서 p50/p99 도 정확하다
+    def __init__(self, size: int = LATENCY_SAMPLE, seed: int = 0):
+        self.size = size
+        self.sample = []
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._rng = random.Random(seed)
+
+    def add(self, latency: float):
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+        if len(self.sample) < self.size:
+            self.sample.append(latency)
+        else:
+            j = self._rng.randrange(self.count)
+            if j < self.size:
+                self.sample[j] = latency
+
+    def summary(self) -> dict:
+        sample = sorted(self.sample)
+        return {
+            "mean": round(self.total / self.count, 4),
+            "p50": sample[len(sample) // 2],
+            "p99": sample[min(len(sample) - 1, int(len(sample) * 0.99))],
+            "max": self.max,
+        }
+
+def run(src: Path | str, dst, workers: int = 0, chunk_lines: int = CHUNK_LINES,
+        rules_path: Path | str = advice.RULES_PATH) -> dict:
+    # dst 는 쓰기 가능한 텍스트 파일 객체. 결과를 묶음마다 쓰면서 통계를 모아 돌려준다
+    started = time.perf_counter()
+    latencies = LatencyStats()
+    labeled = correct = routed = 0
+    with open(src, encoding="utf-8") as f:
+        lines = ((n, line) for n, line in enumerate(f, 1) if line.strip())
+        for text, rows, bad in _pipeline(lines, _answer_lines, workers, chunk_lines, str(rules_path)):
+            dst.write(text)
+            for n, reason in bad:
+                print(f"{src}:{n}: {reason} → 건너뜀", file=sys.stderr)
+            for latency, ok, hit in rows:
+                latencies.add(latency)
+                routed += ok
+                if hit is not None:
+                    labeled += 1
+                    correct += hit
+    stats = {"questions": latencies.count, "routed": routed, "seconds": round(time.perf_counter() - started, 3)}
+    if latencies.count:
+        stats["latency_ms"] = latencies.summary()
+    if workers <= 0:
+        # 워커를 쓰면 캐시가 프로세스마다 따로라 현재 프로세스에서 돌릴 때만
+        stats["route_cache"] = advice.current_rules(rules_path).cache_info()
+    if labeled:
+        stats["labeled"] = labeled
+        stats["accuracy"] = round(correct / labeled, 4)
+    return stats
+
+# =========================
+# ---- CLI ----
+# =========================
+def main():
+    parser = argparse.ArgumentParser(description="고민 JSONL 을 한꺼번에 라우팅/답변 (정확도·지연 측정)")
+    parser.add_argument("questions", type=Path, help="입력 .jsonl")
+    parser.add_argument("-o", "--output", default="-", help="출력 .jsonl (기본: 표준 출력)")
+    parser.add_argument("--workers", type=int, default=0, help="프로세스 수 (0 = 현재 프로세스)")
+    parser.add_argument("--chunk-lines", type=int, default=CHUNK_LINES)
+    parser.add_argument("--rules", type=Path, default=advice.RULES_PATH)
+    args = parser.parse_args()
+
+    if args.output == "-":
+        stats = run(args.questions, sys.stdout, args.workers, args.chunk_lines, args.rules)
+    else:
+        with open(args.output, "w", encoding="utf-8") as dst:
+            stats = run(args.questions, dst, args.workers, args.chunk_lines, args.rules)
+    print(json.dumps(stats, ensure_ascii=False), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
 # app.py
-import json
-import time
-import uuid
 from pathlib import Path
-from datetime import datetime, timedelta, date
-import math
+from datetime import timedelta, date
 
 import pandas as pd
 import streamlit as st
 import altair as alt
 
+from storage import JournalStore, op_set, op_upsert_log, op_delete_log, op_upsert_item, op_delete_item
+from xp_engine import XPEngine, habits_xp
+from rolling import RollingWindows
+from chart_data import downsample
+from timers import ENGINE as TIMERS, new_timer, normalize as normalize_timer, fmt_hms
+
 # =========================
 # ---- 설정/상수 ----------
 # =========================
@@ -19,6 +21,8 @@ DATA_FILE = Path("user_data.json")
 XP_PER_MINUTE = 0.2
 LEVEL_XP = 200
 
+MAX_CHART_POINTS = 180  # 그래프 하나에 보내는 최대 점 개수 (넘으면 주/월 단위로 묶음)
+
 DEFAULT_HABITS = [
     {"name": "수학 문제 20분", "xp": 10},
     {"name": "영어 단어 50개", "xp": 12},
@@ -55,13 +59,7 @@ def today_str(d: date | None = None) -> str:
     d = d or date.today()
     return d.isoformat()
 
-def load_data():
-    if DATA_FILE.exists():
-        try:
-            raw = DATA_FILE.read_text(encoding="utf-8")
-            return json.loads(raw)
-        except Exception:
-            pass
+def default_data() -> dict:
     # 기본 구조: user, habits, logs, pet, timer_defs
     return {
         "user": {
@@ -77,22 +75,43 @@ def load_data():
             "last_active": None,
             "last_level": 1,
         },
-        "timer_defs": []  # persistent timer definitions: {id, title, subject}
+        "timer_defs": []  # 타이머: {id, title, subject, elapsed_sec, running, started_at(epoch)}
     }
 
-def save_data(data: dict):
-    DATA_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+def get_store() -> JournalStore:
+    if "store" not in st.session_state:
+        st.session_state.store = JournalStore(DATA_FILE)
+    return st.session_state.store
 
-def get_logs_df(data: dict) -> pd.DataFrame:
-    if not data.get("logs"):
+def load_data():
+    data = get_store().load(default_data)
+    # 일부 키만 있는 파일(예: bulk_io 로 logs 만 가져온 경우)은 기본값으로 채움
+    for key, value in default_data().items():
+        data.setdefault(key, value)
+    for t in data.get("timer_defs", []):
+        normalize_timer(t)
+    return data
+
+def save_data(data: dict, *ops: dict):
+    # 바뀐 부분(op)만 저널에 덧붙인다. 전체 재직렬화는 compaction 때만
+    get_store().append(data, list(ops))
+
+def get_logs_df(data: dict, start: date | None = None) -> pd.DataFrame:
+    # start 가 있으면 그 날짜 이후 로그만 (LogStore.range 로 bisect, 전체 스캔 없음)
+    rows = data["logs"].range(start.isoformat()) if start else data["logs"].to_list()
+    if not rows:
         return pd.DataFrame(columns=["date", "study_minutes", "habits_completed", "notes"])
-    df = pd.DataFrame(data["logs"])
+    df = pd.DataFrame(rows)
     if "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"]).dt.date
     else:
         df["date"] = pd.to_datetime(df.index).date
-    df["habits_completed"] = df["habits_completed"].apply(lambda x: x if isinstance(x, list) else [])
-    df["habits_count"] = df["habits_completed"].apply(lambda x: len(x))
+    habits = df["habits_completed"]
+    if not habits.map(type).eq(list).all():
+        # 리스트가 아닌 값(None, 문자열 등)이 섞인 경우에만 정리
+        # (.str.len() 은 문자열이면 글자 수를 세버림 → XPEngine 처럼 빈 리스트로)
+        habits = df["habits_completed"] = habits.apply(lambda x: x if isinstance(x, list) else [])
+    df["habits_count"] = habits.str.len().astype(int)
     df["study_minutes"] = df["study_minutes"].fillna(0).astype(int)
     df["xp_from_study"] = df["study_minutes"] * XP_PER_MINUTE
     df["xp_from_habits"] = 0.0
@@ -102,23 +121,70 @@ def habit_xp_lookup(habits: list[dict]) -> dict:
     return {h["name"]: float(h.get("xp", 0)) for h in habits}
 
 def compute_xp(df: pd.DataFrame, habits: list[dict]) -> pd.DataFrame:
-    lookup = habit_xp_lookup(habits)
-    def xp_from_habits(lst):
-        if not isinstance(lst, list):
-            return 0.0
-        return sum(lookup.get(name, 0.0) for name in lst)
     if df.empty:
         return df
     df = df.copy()
-    df["xp_from_habits"] = df["habits_completed"].apply(xp_from_habits)
+    df["xp_from_habits"] = habits_xp(df["habits_completed"], habit_xp_lookup(habits))
     df["xp_total_day"] = df["xp_from_study"] + df["xp_from_habits"]
-    df = df.sort_values("date")
-    df["xp_cum"] = df["xp_total_day"].cumsum()
-    return df
+    return df.sort_values("date")
 
-def total_xp(df: pd.DataFrame) -> float:
-    if df.empty: return 0.0
-    return float(df["xp_total_day"].sum())
+# =========================
+# ---- 파생 데이터 캐시 ----
+# =========================
+# 키는 저장소 버전 (save_data 할 때만 올라감).
+# 사이드바 입력 등으로 rerun 되어도 버전이 같으면 표/그래프를 다시 만들지 않는다.
+def data_version() -> tuple:
+    return (str(DATA_FILE.resolve()), get_store().version)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def logs_frame(version: tuple, _data: dict) -> pd.DataFrame:
+    return compute_xp(get_logs_df(_data), _data.get("habits", []))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def recent_frame(version: tuple, _data: dict, days: int, today: date) -> pd.DataFrame:
+    start = today - timedelta(days=days - 1)
+    return compute_xp(get_logs_df(_data, start), _data.get("habits", []))
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def dashboard_charts(version: tuple, _data: dict, today: date, _engine: XPEngine) -> dict:
+    # Vega-Lite 스펙(dict)까지 만들어서 캐시 → rerun 때 altair 변환/검증도 건너뜀
+    # 그래프마다 필요한 컬럼만 넣어서 브라우저로 가는 데이터 크기를 줄인다
+    df30 = recent_frame(version, _data, 30, today)
+    charts = {}
+    charts["minutes"] = alt.Chart(df30[["date", "study_minutes"]]).mark_line(point=True).encode(
+        x=alt.X('date:T', title='날짜'),
+        y=alt.Y('study_minutes:Q', title='분'),
+        tooltip=['date:T', 'study_minutes:Q']
+    ).properties(height=260)
+    charts["habits"] = alt.Chart(df30[["date", "habits_count"]]).mark_bar().encode(
+        x=alt.X('date:T', title='날짜'),
+        y=alt.Y('habits_count:Q', title='개수'),
+        tooltip=['date:T', 'habits_count:Q']
+    ).properties(height=260)
+    base = alt.Chart(df30[["date", "xp_total_day"]]).encode(x=alt.X('date:T', title='날짜'))
+    charts["xp_day"] = base.mark_line(point=True).encode(
+        y=alt.Y('xp_total_day:Q', title='일일 XP'),
+        tooltip=['date:T', 'xp_total_day:Q']
+    ).properties(height=220)
+    # 누적 XP 는 엔진이 로그 변경마다 이어서 고쳐 둔 값 (전체 표를 다시 cumsum 하지 않음)
+    # 전체 기간이라 길어지면 주/월 단위 마지막 값으로 줄인다
+    cum = pd.DataFrame(_engine.xp_cum(), columns=["date", "xp_cum"])
+    cum["date"] = pd.to_datetime(cum["date"]).dt.date
+    cum, unit = downsample(cum, {"xp_cum": "last"}, max_points=MAX_CHART_POINTS)
+    charts["xp_cum"] = alt.Chart(cum).mark_line(point=len(cum) <= 60).encode(
+        x=alt.X('date:T', title='날짜' if unit == "일" else f'날짜 ({unit} 단위)'),
+        y=alt.Y('xp_cum:Q', title='누적 XP'),
+        tooltip=['date:T', 'xp_cum:Q']
+    ).properties(height=220)
+    return {name: chart.to_dict() for name, chart in charts.items()}
+
+def get_windows(data: dict) -> RollingWindows:
+    # 최근 7/30/90일 합계. 엔진과 마찬가지로 로그가 통째로 바뀔 때만 새로 만든다
+    windows = st.session_state.get("windows")
+    if windows is None or windows.logs is not data["logs"]:
+        windows = RollingWindows(data["logs"])
+        st.session_state.windows = windows
+    return windows
 
 def level_from_xp(xp: float) -> int:
     return int(xp // LEVEL_XP) + 1
@@ -130,24 +196,14 @@ def xp_to_next_level(xp: float) -> tuple[int, float, float]:
     needed = LEVEL_XP - earned_in_level
     return lvl, earned_in_level, max(0.0, needed)
 
-def current_streak(df: pd.DataFrame) -> int:
-    if df.empty: return 0
-    active_dates = set(d for d, m, c in zip(df["date"], df["study_minutes"], df["habits_count"]) if (m and m>0) or (c and c>0))
-    streak = 0
-    day = date.today()
-    while day in active_dates:
-        streak += 1
-        day -= timedelta(days=1)
-    return streak
-
-def days_since_activity(df: pd.DataFrame) -> int:
-    if df.empty:
-        return 999
-    active = df[(df["study_minutes"]>0) | (df["habits_count"]>0)]
-    if active.empty:
-        return 999
-    last_day = active["date"].max()
-    return (date.today() - last_day).days
+def get_engine(data: dict) -> XPEngine:
+    # 세션당 하나. 로그가 통째로 바뀐 경우(초기화/다른 세션 compaction)만 새로 만든다
+    engine = st.session_state.get("engine")
+    if engine is None or engine.logs is not data["logs"]:
+        engine = XPEngine(data["logs"], data.get("habits", []), XP_PER_MINUTE)
+        st.session_state.engine = engine
+    engine.sync_habits(data.get("habits", []))
+    return engine
 
 def get_pet_stage(level: int) -> tuple[str, str]:
     stage = ("🥚", "알 단계")
@@ -156,8 +212,7 @@ def get_pet_stage(level: int) -> tuple[str, str]:
             stage = form
     return stage
 
-def pet_status(data: dict, df: pd.DataFrame, xp_sum: float) -> dict:
-    dgap = days_since_activity(df)
+def pet_status(data: dict, dgap: int, xp_sum: float) -> dict:
     hunger = int(data["pet"].get("hunger", 80))
     if dgap == 0:
         hunger = min(100, hunger + HUNGER_GAIN_PER_ACTIVITY)
@@ -181,60 +236,71 @@ def pet_status(data: dict, df: pd.DataFrame, xp_sum: float) -> dict:
         "level": level
     }
 
-def add_minutes_to_log(data: dict, log_date: date, minutes: int, habits_completed: list[str]=None, notes: str=""):
-    if minutes <= 0 and (not habits_completed):
-        return False
+def _touch_pet(data: dict, dstr: str):
+    data["pet"]["last_active"] = dstr
+    data["pet"]["hunger"] = min(100, int(data["pet"].get("hunger", 80)) + HUNGER_GAIN_PER_ACTIVITY)
+
+def _add_minutes_ops(data: dict, log_date: date, minutes: int, habits_completed: list[str]=None, notes: str="") -> list[dict]:
+    # data(최신 상태)의 오늘 기록에 더하고 op 목록을 돌려준다. 저장은 부르는 쪽에서 store.update 로
     dstr = log_date.isoformat()
-    found = False
-    for row in data["logs"]:
-        if row["date"] == dstr:
-            # 기존에 더하기
-            row["study_minutes"] = int(row.get("study_minutes", 0)) + int(minutes)
-            if habits_completed:
-                existing = row.get("habits_completed", [])
-                if not isinstance(existing, list): existing = []
-                row["habits_completed"] = existing + habits_completed
-            if notes:
-                row["notes"] = (row.get("notes","") + " | " + notes).strip(" | ")
-            found = True
-            break
-    if not found:
-        data["logs"].append({
+    row = data["logs"].get(dstr)
+    if row is not None:
+        # 기존에 더하기
+        row["study_minutes"] = int(row.get("study_minutes", 0)) + int(minutes)
+        if habits_completed:
+            existing = row.get("habits_completed", [])
+            if not isinstance(existing, list): existing = []
+            row["habits_completed"] = existing + habits_completed
+        if notes:
+            row["notes"] = (row.get("notes","") + " | " + notes).strip(" | ")
+    else:
+        row = {
             "date": dstr,
             "study_minutes": int(minutes),
             "habits_completed": habits_completed or [],
             "notes": notes or ""
-        })
+        }
+    data["logs"].upsert(row)  # 제자리 수정도 upsert 로 알려야 XP 엔진이 갱신됨
+    ops = [op_upsert_log(row)]
     # 펫 last_active/hunger 반영
     if minutes > 0 or (habits_completed and len(habits_completed)>0):
-        data["pet"]["last_active"] = dstr
-        data["pet"]["hunger"] = min(100, int(data["pet"].get("hunger", 80)) + HUNGER_GAIN_PER_ACTIVITY)
-    save_data(data)
+        _touch_pet(data, dstr)
+        ops.append(op_set("pet", data["pet"]))
+    return ops
+
+def add_minutes_to_log(data: dict, log_date: date, minutes: int, habits_completed: list[str]=None, notes: str=""):
+    if minutes <= 0 and (not habits_completed):
+        return False
+    # 잠금 안에서 최신 기록을 읽고 더한다 → 다른 탭이 같은 날에 더한 분이 사라지지 않음
+    get_store().update(data, lambda d: _add_minutes_ops(d, log_date, minutes, habits_completed, notes))
     return True
 
 def set_log(data: dict, log_date: date, study_minutes: int, habits_completed: list[str], notes: str):
     # 기존에 덮어쓰기(upsert)
     dstr = log_date.isoformat()
-    found = False
-    for row in data["logs"]:
-        if row["date"] == dstr:
+
+    def apply(data: dict) -> list[dict]:
+        row = data["logs"].get(dstr)
+        if row is not None:
             row["study_minutes"] = int(study_minutes)
             row["habits_completed"] = habits_completed
             row["notes"] = notes
-            found = True
-            break
-    if not found:
-        data["logs"].append({
-            "date": dstr,
-            "study_minutes": int(study_minutes),
-            "habits_completed": habits_completed or [],
-            "notes": notes or ""
-        })
-    # 반영
-    if (study_minutes and study_minutes>0) or (habits_completed and len(habits_completed)>0):
-        data["pet"]["last_active"] = dstr
-        data["pet"]["hunger"] = min(100, int(data["pet"].get("hunger", 80)) + HUNGER_GAIN_PER_ACTIVITY)
-    save_data(data)
+        else:
+            row = {
+                "date": dstr,
+                "study_minutes": int(study_minutes),
+                "habits_completed": habits_completed or [],
+                "notes": notes or ""
+            }
+        data["logs"].upsert(row)
+        ops = [op_upsert_log(row)]
+        # 반영 (펫은 잠금 안에서 최신 값 기준으로)
+        if (study_minutes and study_minutes>0) or (habits_completed and len(habits_completed)>0):
+            _touch_pet(data, dstr)
+            ops.append(op_set("pet", data["pet"]))
+        return ops
+
+    get_store().update(data, apply)
 
 # =========================
 # ---- 세션 초기화 -------
@@ -246,22 +312,10 @@ st.caption("공부/습관을 기록하고 XP를 모아 레벨업! 과목별 타
 if "data" not in st.session_state:
     st.session_state.data = load_data()
 data = st.session_state.data
-
-# Persistent timer definitions loaded from data; runtime states in session_state['timers']
-if "timers" not in st.session_state:
-    st.session_state.timers = {}  # id -> {id,title,subject,elapsed_sec, running(bool), start_time}
-# sync timer defs into session_state.timers (create runtime entries if missing)
-for td in data.get("timer_defs", []):
-    tid = td["id"]
-    if tid not in st.session_state.timers:
-        st.session_state.timers[tid] = {
-            "id": tid,
-            "title": td.get("title", "무제"),
-            "subject": td.get("subject", "일반"),
-            "elapsed_sec": 0.0,
-            "running": False,
-            "start_time": None
-        }
+# 다른 탭/세션에서 시작·정지한 타이머 등 저널에 새로 붙은 변경 받아오기
+get_store().refresh(data)
+if get_store().recovered_from:
+    st.warning(f"저장 파일이 손상되어 {get_store().recovered_from.name} 로 옮겨두었어요. 저널에 남은 기록만 복구했어요.")
 
 # =========================
 # ---- 사이드바: 사용자, 테마, 기록(수동) 및 타이머 추가 ----
@@ -273,7 +327,7 @@ with st.sidebar:
     data["user"]["bg_color"] = st.color_picker("배경 색상(HEX)", value=data["user"].get("bg_color","#ffffff"))
     data["user"]["font_color"] = st.color_picker("글자 색상(HEX)", value=data["user"].get("font_color","#000000"))
     if st.button("🎨 저장(테마/이름)"):
-        save_data(data)
+        save_data(data, op_set("user", data["user"]))
         st.success("저장 완료!")
         st.rerun()
 
@@ -299,19 +353,9 @@ with st.sidebar:
         if not new_title.strip():
             st.warning("타이틀을 입력해줘!")
         else:
-            tid = str(uuid.uuid4())
-            tdef = {"id": tid, "title": new_title.strip(), "subject": new_subject.strip() or "일반"}
+            tdef = new_timer(new_title.strip(), new_subject.strip() or "일반")
             data.setdefault("timer_defs", []).append(tdef)
-            save_data(data)
-            # create runtime timer
-            st.session_state.timers[tid] = {
-                "id": tid,
-                "title": tdef["title"],
-                "subject": tdef["subject"],
-                "elapsed_sec": 0.0,
-                "running": False,
-                "start_time": None
-            }
+            save_data(data, op_upsert_item("timer_defs", tdef))
             st.success(f"타이머 '{tdef['title']}' 추가됨")
             st.rerun()
 
@@ -331,12 +375,16 @@ st.markdown(
 # =========================
 # ---- 메인: 데이터/지표 계산 ----
 # =========================
-df = get_logs_df(data)
-df = compute_xp(df, data.get("habits", []))
-xp_sum = total_xp(df)
+engine = get_engine(data)
+windows = get_windows(data)
+xp_sum = engine.total_xp
 lvl, earned_in_level, needed = xp_to_next_level(xp_sum)
-streak = current_streak(df)
-pet = pet_status(data, df, xp_sum)
+streak = engine.current_streak()
+pet = pet_status(data, engine.days_since_activity(), xp_sum)
+
+# 그래프/기록 탭용 표 (버전 캐시)
+version = data_version()
+df = logs_frame(version, data)
 
 # 레벨업 연출 (저장된 last_level 기준)
 prev_level = int(data["pet"].get("last_level", 1))
@@ -347,7 +395,7 @@ if pet["level"] > prev_level:
         unsafe_allow_html=True
     )
     data["pet"]["last_level"] = pet["level"]
-    save_data(data)
+    save_data(data, op_set("pet", data["pet"]))
 
 # 상단 KPI
 c1, c2, c3, c4 = st.columns(4)
@@ -369,44 +417,27 @@ with tab_dash:
     if df.empty:
         st.info("아직 데이터가 없어요. 사이드바에서 오늘 기록을 추가하거나 타이머로 공부시간을 저장해보세요.")
     else:
-        d30 = date.today() - timedelta(days=29)
-        df30 = df[df["date"] >= d30].copy()
+        charts = dashboard_charts(version, data, date.today(), engine)
+
+        w1, w2, w3 = st.columns(3)
+        for col, days in zip((w1, w2, w3), (7, 30, 90)):
+            col.metric(f"최근 {days}일 공부", f"{windows.total(days, 'study_minutes')}분",
+                       help=f"기록한 날 {windows.count(days)}일 · 완료 습관 {windows.total(days, 'habits_count')}개")
 
         colA, colB = st.columns(2)
         with colA:
             st.markdown("**📈 일별 공부 시간(분)**")
-            chart1 = alt.Chart(df30).mark_line(point=True).encode(
-                x=alt.X('date:T', title='날짜'),
-                y=alt.Y('study_minutes:Q', title='분'),
-                tooltip=['date:T', 'study_minutes:Q']
-            ).properties(height=260)
-            st.altair_chart(chart1, use_container_width=True)
+            st.vega_lite_chart(charts["minutes"], use_container_width=True)
 
         with colB:
             st.markdown("**🧱 일별 완료 습관 수**")
-            chart2 = alt.Chart(df30).mark_bar().encode(
-                x=alt.X('date:T', title='날짜'),
-                y=alt.Y('habits_count:Q', title='개수'),
-                tooltip=['date:T', 'habits_count:Q']
-            ).properties(height=260)
-            st.altair_chart(chart2, use_container_width=True)
+            st.vega_lite_chart(charts["habits"], use_container_width=True)
 
         colC, colD = st.columns(2)
         with colC:
             st.markdown("**⭐ 일별 XP & 누적 XP**")
-            base = alt.Chart(df30).encode(x=alt.X('date:T', title='날짜'))
-            line_total = base.mark_line(point=True).encode(
-                y=alt.Y('xp_total_day:Q', title='일일 XP'),
-                tooltip=['date:T', 'xp_total_day:Q']
-            )
-            cum = df.copy()
-            cum_chart = alt.Chart(cum).mark_line(point=True).encode(
-                x=alt.X('date:T', title='날짜'),
-                y=alt.Y('xp_cum:Q', title='누적 XP'),
-                tooltip=['date:T', 'xp_cum:Q']
-            ).properties(height=220)
-            st.altair_chart(line_total.properties(height=220), use_container_width=True)
-            st.altair_chart(cum_chart, use_container_width=True)
+            st.vega_lite_chart(charts["xp_day"], use_container_width=True)
+            st.vega_lite_chart(charts["xp_cum"], use_container_width=True)
 
         with colD:
             st.markdown("**🔥 레벨 진행도**")
@@ -431,10 +462,8 @@ with tab_pet:
         st.write("- 공부 30~60분 기록해보기")
         st.write("- 습관 2개 만들고 오늘 1개 이상 완료하기")
     else:
-        d7 = date.today() - timedelta(days=6)
-        df7 = df[df["date"] >= d7]
-        avg_min = 0 if df7.empty else int(df7["study_minutes"].mean())
-        avg_hab = 0 if df7.empty else float(df7["habits_count"].mean())
+        avg_min = int(windows.mean(7, "study_minutes"))
+        avg_hab = windows.mean(7, "habits_count")
         if avg_min < 60:
             st.write(f"- 최근 1주 평균 공부 {avg_min}분 ➜ **오늘 90분** 도전!")
         else:
@@ -447,83 +476,101 @@ with tab_pet:
 # =========================
 # ---- 3) 타이머 탭 -----
 # =========================
+# 시간 계산/조작은 timers.ENGINE (프로세스 공용, monotonic 기준)
+# 저장은 타이머 한 개 단위 op → 다른 탭에서 다른 타이머를 건드려도 덮어쓰지 않음
+# 조작/저장은 store.update 로 (잠금 안에서 최신 상태를 받아온 뒤 고치기)
+def find_timer(tid: str) -> dict | None:
+    # 조각은 예전 인자로 다시 불리므로 매번 현재 data 에서 찾는다 (다른 세션 병합 대비)
+    return next((x for x in data.get("timer_defs", []) if x["id"] == tid), None)
+
+def timer_action(tid: str, action: str):
+    # 잠금 안에서 다른 탭의 상태부터 받아온 뒤 조작 (이미 시작된 타이머를 또 시작하지 않도록)
+    def apply(data: dict) -> list[dict]:
+        t = find_timer(tid)
+        if t is None:
+            return []
+        if action == "start":
+            changed = TIMERS.start(t)
+        elif action == "pause":
+            changed = TIMERS.pause(t)
+        else:
+            TIMERS.reset(t)
+            changed = True
+        return [op_upsert_item("timer_defs", t)] if changed else []
+
+    get_store().update(data, apply)
+
+def save_timer_minutes(tid: str) -> tuple[dict | None, int]:
+    # 타이머의 분을 오늘 기록에 옮기기. 조각(fragment) rerun 에서는 스크립트 맨 위의 refresh 가
+    # 안 돌기 때문에 잠금 안에서 최신 타이머/오늘 기록을 받아와 한 번에 쓴다
+    # → 다른 탭이 이미 저장/정지한 분을 두 번 세거나 그 탭이 더한 분을 덮어쓰지 않음
+    saved = (None, 0)
+
+    def apply(data: dict) -> list[dict]:
+        nonlocal saved
+        t = find_timer(tid)
+        if t is None or TIMERS.elapsed(t) < 60:
+            saved = (t, 0)
+            return []
+        # 분 단위만 떼어가고 남은 초는 타이머에 남김
+        minutes = TIMERS.take_minutes(t)
+        saved = (t, minutes)
+        notes = f"타이머: {t['title']}({t['subject']})"
+        return [op_upsert_item("timer_defs", t), *_add_minutes_ops(data, date.today(), minutes, notes=notes)]
+
+    get_store().update(data, apply)
+    return saved
+
+def timer_clock(tid: str):
+    t = find_timer(tid)
+    if t is None:
+        return
+    st.markdown(f"<div style='font-size:1.4rem'>{fmt_hms(TIMERS.elapsed(t))}</div>", unsafe_allow_html=True)
+
+@st.fragment
+def timer_panel(tid: str):
+    # 시작/일시정지/리셋은 on_click 콜백으로 처리 → 이 조각(fragment)만 다시 그린다
+    # 저장/삭제는 오늘 기록·목록이 바뀌므로 전체 rerun
+    t = find_timer(tid)
+    if t is None:
+        return
+    col_title, col_controls = st.columns([3, 5])
+    with col_title:
+        st.markdown(f"### {t['title']}  —  *{t['subject']}*")
+        # 진행 중일 때만 시계 부분이 1초마다 스스로 갱신
+        st.fragment(timer_clock, run_every=1 if t.get("running") else None)(tid)
+
+    with col_controls:
+        b1, b2, b3, b4, b5 = st.columns(5)
+        b1.button("▶️ 시작", key=f"start_{tid}", on_click=timer_action, args=(tid, "start"))
+        b2.button("⏸ 일시정지", key=f"pause_{tid}", on_click=timer_action, args=(tid, "pause"))
+        # Save -> add minutes to today's log and reset timer elapsed
+        if b3.button("💾 저장(오늘에 추가)", key=f"save_{tid}"):
+            saved, add_min = save_timer_minutes(tid)
+            if saved is None:
+                st.rerun()  # 다른 탭에서 삭제됨
+            elif add_min > 0:
+                st.success(f"오늘 {add_min}분이 '{saved['title']}'에서 저장되었어요!")
+                st.rerun()
+            else:
+                st.warning("저장할 분(min)이 0분이에요. 최소 1분 이상이어야 저장됩니다.")
+        b4.button("↩️ 리셋", key=f"reset_{tid}", on_click=timer_action, args=(tid, "reset"))
+        # Remove timer definition (영구 삭제)
+        if b5.button("🗑 타이머 삭제", key=f"del_{tid}"):
+            data["timer_defs"] = [x for x in data.get("timer_defs", []) if x["id"] != tid]
+            TIMERS.forget(tid)
+            save_data(data, op_delete_item("timer_defs", tid))
+            st.success(f"타이머 '{t['title']}' 삭제됨")
+            st.rerun()
+
 with tab_timers:
     st.subheader("과목별 타이머 ⏱ (복수 지원)")
     st.markdown("타이머를 시작→일시정지→저장(오늘 기록에 분 단위로 추가) 방식으로 사용하세요.")
-    if not st.session_state.timers:
+    if not data.get("timer_defs"):
         st.info("아직 타이머가 없어요. 사이드바에서 타이머를 추가해보세요.")
     else:
-        # 정렬: 최근 추가 순
-        for tid, t in list(st.session_state.timers.items()):
-            col_title, col_controls = st.columns([3, 5])
-            with col_title:
-                st.markdown(f"### {t['title']}  —  *{t['subject']}*")
-                # 현재 elapsed 계산
-                elapsed = t["elapsed_sec"]
-                if t["running"] and t["start_time"]:
-                    elapsed += time.time() - t["start_time"]
-                hh = int(elapsed // 3600)
-                mm = int((elapsed % 3600) // 60)
-                ss = int(elapsed % 60)
-                st.markdown(f"<div style='font-size:1.4rem'>{hh:02d}:{mm:02d}:{ss:02d}</div>", unsafe_allow_html=True)
-
-            with col_controls:
-                b1, b2, b3, b4, b5 = st.columns(5)
-                # Start (resume)
-                if b1.button("▶️ 시작", key=f"start_{tid}"):
-                    if not st.session_state.timers[tid]["running"]:
-                        st.session_state.timers[tid]["running"] = True
-                        st.session_state.timers[tid]["start_time"] = time.time()
-                        st.success(f"'{t['title']}' 시작")
-                        st.rerun()
-                # Pause
-                if b2.button("⏸ 일시정지", key=f"pause_{tid}"):
-                    if st.session_state.timers[tid]["running"]:
-                        elapsed_add = time.time() - st.session_state.timers[tid]["start_time"]
-                        st.session_state.timers[tid]["elapsed_sec"] += elapsed_add
-                        st.session_state.timers[tid]["running"] = False
-                        st.session_state.timers[tid]["start_time"] = None
-                        st.success(f"'{t['title']}' 일시정지 (세션 저장: {int(elapsed_add//60)}분)")
-                        st.rerun()
-                # Save -> add minutes to today's log and reset timer elapsed
-                if b3.button("💾 저장(오늘에 추가)", key=f"save_{tid}"):
-                    # compute total seconds
-                    total_sec = st.session_state.timers[tid]["elapsed_sec"]
-                    if st.session_state.timers[tid]["running"] and st.session_state.timers[tid]["start_time"]:
-                        total_sec += time.time() - st.session_state.timers[tid]["start_time"]
-                    add_min = int(total_sec // 60)
-                    if add_min > 0:
-                        notes = f"타이머: {t['title']}({t['subject']})"
-                        added = add_minutes_to_log(data, date.today(), add_min, habits_completed=None, notes=notes)
-                        if added:
-                            # subtract saved seconds (so leftover seconds remain)
-                            leftover = total_sec - add_min * 60
-                            st.session_state.timers[tid]["elapsed_sec"] = leftover
-                            st.session_state.timers[tid]["running"] = False
-                            st.session_state.timers[tid]["start_time"] = None
-                            st.success(f"오늘 {add_min}분이 '{t['title']}'에서 저장되었어요!")
-                            st.rerun()
-                        else:
-                            st.warning("저장 실패함.")
-                    else:
-                        st.warning("저장할 분(min)이 0분이에요. 최소 1분 이상이어야 저장됩니다.")
-                # Reset
-                if b4.button("↩️ 리셋", key=f"reset_{tid}"):
-                    st.session_state.timers[tid]["elapsed_sec"] = 0.0
-                    st.session_state.timers[tid]["running"] = False
-                    st.session_state.timers[tid]["start_time"] = None
-                    st.success(f"'{t['title']}' 리셋됨")
-                    st.rerun()
-                # Remove timer definition (영구 삭제)
-                if b5.button("🗑 타이머 삭제", key=f"del_{tid}"):
-                    # remove from persistent defs
-                    data["timer_defs"] = [x for x in data.get("timer_defs", []) if x["id"] != tid]
-                    save_data(data)
-                    # remove runtime
-                    if tid in st.session_state.timers:
-                        del st.session_state.timers[tid]
-                    st.success(f"타이머 '{t['title']}' 삭제됨")
-                    st.rerun()
+        for t in list(data["timer_defs"]):
+            timer_panel(t["id"])
 
 # =========================
 # ---- 4) 습관 탭 -------
@@ -545,7 +592,7 @@ with tab_habits:
                 new_habits.append({"name": name, "xp": xp})
                 names_seen.add(name)
         data["habits"] = new_habits if new_habits else data.get("habits", DEFAULT_HABITS)
-        save_data(data)
+        save_data(data, op_set("habits", data["habits"]))
         st.success("습관 저장 완료!")
         st.rerun()
 
@@ -569,11 +616,9 @@ with tab_history:
         st.markdown("##### 🗑 특정 날짜 기록 삭제")
         del_date = st.date_input("삭제할 날짜 선택", value=date.today(), max_value=date.today(), key="delete_date")
         if st.button("삭제 실행"):
-            before = len(data["logs"])
-            data["logs"] = [r for r in data["logs"] if r["date"] != del_date.isoformat()]
-            after = len(data["logs"])
-            save_data(data)
-            if after < before:
+            removed = data["logs"].delete(del_date.isoformat())
+            save_data(data, op_delete_log(del_date.isoformat()))
+            if removed is not None:
                 st.success(f"{del_date.isoformat()} 기록 삭제됨.")
             else:
                 st.warning("해당 날짜 기록이 없어요.")
@@ -587,14 +632,14 @@ with tab_settings:
     c1, c2 = st.columns(2)
     with c1:
         if st.button("🔄 오늘만 초기화"):
-            data["logs"] = [r for r in data["logs"] if r["date"] != today_str()]
-            save_data(data)
+            data["logs"].delete(today_str())
+            save_data(data, op_delete_log(today_str()))
             st.success("오늘 기록만 초기화됨")
             st.rerun()
     with c2:
         if st.button("🧹 전체 초기화 (되돌릴 수 없음)"):
             try:
-                DATA_FILE.unlink(missing_ok=True)
+                get_store().reset()
             except Exception:
                 pass
             st.session_state.pop("data", None)
@@ -602,7 +647,7 @@ with tab_settings:
             st.rerun()
 
     st.markdown("---")
-    st.caption("팁: 타이머는 분 단위로 기록됩니다. 1분 미만은 저장되지 않으니 주의!")
+    st.caption("팁: 타이머는 분 단위로 기록됩니다. 1분 미만은 타이머에 남아 다음 저장 때 합쳐져요. 진행 중인 타이머는 새로고침/재시작해도 이어서 흘러요.")
 
 # 푸터
 st.caption(f"© 갓생 다마고치 — 사용자: {data['user']['name']} · 펫: {data['user']['pet_name']}")
@@ -0,0 +1,411 @@
+# bench.py
+# 성능 측정 스크립트
+#   python bench.py storage
+#   python bench.py xp
+#   python bench.py todos
+#   python bench.py db
+#   python bench.py fts
+#   python bench.py bulk
+#   python bench.py advice
+import argparse
+import contextlib
+import json
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# =========================
+# ---- 공통 ---------------
+# =========================
+def fake_logs(days: int) -> list[dict]:
+    start = date.today() - timedelta(days=days - 1)
+    habits = ["수학 문제 20분", "영어 단어 50개", "운동 30분", "정리/루틴 체크"]
+    return [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "study_minutes": (i * 37) % 180,
+            "habits_completed": habits[: i % 5],
+            "notes": f"회고 {i}",
+        }
+        for i in range(days)
+    ]
+
+def report(name: str, samples: list[float]):
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{name:<32} mean {statistics.mean(samples) * 1000:8.3f} ms   p99 {p99 * 1000:8.3f} ms")
+
+# =========================
+# ---- storage ------------
+# =========================
+def bench_storage(args):
+    from storage import JournalStore, op_set, op_upsert_log
+
+    data = {"user": {"name": "사용자"}, "habits": [], "pet": {"hunger": 80},
+            "logs": fake_logs(args.days), "timer_defs": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "user_data.json"
+
+        # 기존 방식: 클릭마다 전체 파일 다시 쓰기
+        samples = []
+        for _ in range(args.writes):
+            t = time.perf_counter()
+            path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            samples.append(time.perf_counter() - t)
+        report("full rewrite", samples)
+
+        # 저널 방식: 잠금 + 버전 확인 + append (+ 가끔 compaction)
+        store = JournalStore(path)
+        store.compact(data)
+        row = data["logs"][-1]
+        samples = []
+        for i in range(args.writes):
+            row["study_minutes"] = i
+            t = time.perf_counter()
+            store.append(data, [op_upsert_log(row), op_set("pet", data["pet"])])
+            samples.append(time.perf_counter() - t)
+        report("journal append", samples)
+
+# =========================
+# ---- xp -----------------
+# =========================
+def bench_xp(args):
+    import pandas as pd
+    from xp_engine import habits_xp
+
+    habits = [{"name": n, "xp": x} for n, x in
+              [("수학 문제 20분", 10), ("영어 단어 50개", 12), ("운동 30분", 15), ("정리/루틴 체크", 8)]]
+    lookup = {h["name"]: float(h["xp"]) for h in habits}
+    df = pd.DataFrame(fake_logs(args.days))
+
+    def per_row(series):
+        # 기존 방식: 행마다 lambda + dict 조회
+        return series.apply(lambda lst: sum(lookup.get(name, 0.0) for name in lst) if isinstance(lst, list) else 0.0)
+
+    for name, fn in [("apply(lambda) per row", per_row),
+                     ("explode + join + bincount", lambda s: habits_xp(s, lookup))]:
+        samples = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            out = fn(df["habits_completed"])
+            samples.append(time.perf_counter() - t)
+        report(f"{name} ({args.days} days)", samples)
+    assert (per_row(df["habits_completed"]) == habits_xp(df["habits_completed"], lookup)).all()
+
+# =========================
+# ---- todos --------------
+# =========================
+def bench_todos(args):
+    from todo_sync import flush_done, record_toggle, take_toggles, todo_key
+
+    def make_db():
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE todos(id INTEGER PRIMARY KEY AUTOINCREMENT, task TEXT, done INTEGER)")
+        conn.executemany("INSERT INTO todos(task,done) VALUES(?,?)",
+                         [(f"할 일 {i}", i % 3 == 0) for i in range(args.rows)])
+        conn.commit()
+        writes = [0]
+        conn.set_trace_callback(lambda sql: writes.__setitem__(0, writes[0] + sql.startswith("UPDATE")))
+        return conn, writes
+
+    def old_way(conn, rows, states, toggled):
+        # 기존: 모든 행 UPDATE + commit
+        for row in rows:
+            conn.execute("UPDATE todos SET done=? WHERE id=?", (int(states[row[0]]), row[0]))
+        conn.commit()
+
+    def new_way(conn, rows, states, toggled):
+        # on_change 콜백이 모아 둔 토글만 쓰기
+        session = {todo_key(toggled): states[toggled]}
+        record_toggle(session, toggled)
+        flush_done(conn, take_toggles(session))
+
+    for name, fn in [("UPDATE every row", old_way), ("toggles + executemany", new_way)]:
+        conn, writes = make_db()
+        samples = []
+        for i in range(args.clicks):
+            # 한 번의 상호작용 = 체크박스 하나 토글 후 rerun
+            rows = conn.execute("SELECT id, task, done FROM todos").fetchall()
+            states = {r[0]: bool(r[2]) for r in rows}
+            toggled = rows[(i * 7) % len(rows)][0]
+            states[toggled] = not states[toggled]
+            t = time.perf_counter()
+            fn(conn, rows, states, toggled)
+            samples.append(time.perf_counter() - t)
+        report(f"{name} ({args.rows} rows)", samples)
+        print(f"{'':<32} UPDATE statements per click: {writes[0] / args.clicks:.1f}")
+
+# =========================
+# ---- db (동시 세션) ------
+# =========================
+def bench_db(args):
+    import study_db
+
+    def plain_insert(conn, day, hours):
+        # 기존 스키마(날짜 중복 허용)용
+        conn.execute("INSERT INTO studytime(date,hours) VALUES(?,?)", (day, hours))
+        conn.commit()
+
+    def session(borrow, add_hours, n_ops, lat, errors):
+        # 세션 하나 흉내: 할 일 추가/체크, 공부 기록, 통계 읽기. 연산마다 연결을 빌렸다 돌려줌
+        for i in range(n_ops):
+            t = time.perf_counter()
+            conn = None
+            try:
+                with borrow() as conn:
+                    cur = conn.cursor()
+                    kind = i % 4
+                    if kind == 0:
+                        cur.execute("INSERT INTO todos(task,done) VALUES(?,?)", (f"할 일 {i}", 0))
+                        conn.commit()
+                    elif kind == 1:
+                        cur.execute("UPDATE todos SET done=1 WHERE id=?", (i,))
+                        conn.commit()
+                    elif kind == 2:
+                        add_hours(conn, date.today().isoformat(), 1)
+                    else:
+                        cur.execute("SELECT date, SUM(hours) FROM studytime GROUP BY date")
+                        cur.fetchall()
+            except Exception:
+                # 공유 연결에서는 커서/트랜잭션이 섞여 SystemError 등도 난다
+                errors.append(1)
+                # 실패한 트랜잭션을 열어 둔 채로 두면 쓰기 잠금을 쥐고 있어서
+                # 다른 세션이 전부 busy timeout 만큼 기다리게 된다 (풀은 돌려받을 때 알아서 롤백)
+                if conn is not None and conn.in_transaction:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+            lat.append(time.perf_counter() - t)
+
+    def run(name, borrow, add_hours):
+        lat, errors = [], []
+        threads = [threading.Thread(target=session, args=(borrow, add_hours, args.ops, lat, errors))
+                   for _ in range(args.sessions)]
+        t = time.perf_counter()
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        wall = time.perf_counter() - t
+        report(f"{name} ({args.sessions} sessions)", lat)
+        print(f"{'':<32} {len(lat) / wall:8.0f} ops/s   errors {len(errors)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 기존 방식: 모듈 전역 연결 하나를 모든 세션이 공유, 기본 저널 모드
+        old_path = Path(tmp) / "old.db"
+        shared = sqlite3.connect(old_path, check_same_thread=False)
+        for stmt in study_db.MIGRATIONS[0]:
+            shared.execute(stmt)
+        shared.commit()
+        run("shared connection", lambda: contextlib.nullcontext(shared), plain_insert)
+        shared.close()
+
+        new_path = Path(tmp) / "new.db"
+        # 새 스키마는 하루 한 행 (UNIQUE date) → 앱과 같은 upsert 로 기록
+        run("pooled WAL", lambda: study_db.connection(new_path), study_db.add_study_hours)
+        print(f"{'':<32} connections opened: {study_db.pool(new_path).opened} "
+              f"(pool size {study_db.POOL_SIZE}, {args.sessions * args.ops} ops)")
+        study_db.close(new_path)
+
+# =========================
+# ---- fts (메모 검색) ----
+# =========================
+def bench_fts(args):
+    import random
+    import study_db
+
+    rnd = random.Random(0)
+    words = ["수학", "미적분", "확률과 통계", "영어 단어", "문법", "국어", "비문학", "독해", "물리학",
+             "화학 반응", "생명과학", "지구과학", "한국사", "세계사", "모의고사", "오답노트", "개념 정리",
+             "수행평가", "발표 준비", "동아리", "진로 탐색", "독서록", "봉사활동", "복습", "예습"]
+    with tempfile.TemporaryDirectory() as tmp, study_db.connection(Path(tmp) / "fts.db") as conn:
+        t = time.perf_counter()
+        with conn:
+            conn.executemany(
+                "INSERT INTO memos(title,content,date) VALUES(?,?,?)",
+                ((" ".join(rnd.sample(words, 2)), " ".join(rnd.choices(words, k=30)) + f" 메모 {i}번",
+                  "2026-01-01") for i in range(args.rows)),
+            )
+        print(f"insert {args.rows} memos (with FTS triggers): {time.perf_counter() - t:.2f} s")
+
+        # 흔한 단어 / 드문 단어 / 없는 단어
+        for query in ["미적분", "생명과학 오답노트", "진로 탐색", "메모 12345번", "없는단어입니다"]:
+            like_cond = " AND ".join(["(title LIKE ? OR content LIKE ?)"] * len(query.split()))
+            like_params = [p for w in query.split() for p in (f"%{w}%", f"%{w}%")]
+            for name, fn in [
+                ("LIKE scan", lambda: conn.execute(
+                    f"SELECT id, title FROM memos WHERE {like_cond} ORDER BY id DESC LIMIT ?",
+                    [*like_params, study_db.SEARCH_LIMIT]).fetchall()),
+                ("FTS5 trigram + bm25", lambda: study_db.search(conn, "memos", query)),
+            ]:
+                samples = []
+                for _ in range(args.repeat):
+                    t = time.perf_counter()
+                    fn()
+                    samples.append(time.perf_counter() - t)
+                report(f"{name} '{query}'", samples)
+
+# =========================
+# ---- bulk (가져오기/내보내기) ----
+# =========================
+def bench_bulk(args):
+    import resource
+    import bulk_io
+    import pandas as pd
+
+    def peak_mb():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "todos.csv"
+        chunks = (pd.DataFrame({"task": [f"할 일 {i}" for i in range(start, min(start + args.chunksize, args.rows))],
+                                "done": [i % 2 for i in range(start, min(start + args.chunksize, args.rows))]})
+                  for start in range(0, args.rows, args.chunksize))
+        bulk_io.write_chunks(src, chunks)
+        print(f"csv {src.stat().st_size / 1e6:.1f} MB, peak RSS so far {peak_mb():.0f} MB")
+
+        db = Path(tmp) / "bulk.db"
+        for name, fn in [("import csv → sqlite", lambda: bulk_io.import_sqlite(db, "todos", src, args.chunksize)),
+                         ("export sqlite → csv", lambda: bulk_io.export_sqlite(db, "todos", Path(tmp) / "out.csv", args.chunksize)),
+                         ("export sqlite → parquet", lambda: bulk_io.export_sqlite(db, "todos", Path(tmp) / "out.parquet", args.chunksize))]:
+            t = time.perf_counter()
+            try:
+                count = fn()
+            except RuntimeError as e:  # pyarrow 없음
+                print(f"{name:<32} skipped: {e}")
+                continue
+            elapsed = time.perf_counter() - t
+            print(f"{name:<32} {count} rows  {elapsed:6.2f} s  {count / elapsed:9.0f} rows/s  peak RSS {peak_mb():.0f} MB")
+
+# =========================
+# ---- advice (키워드 라우팅) ----
+# =========================
+def bench_advice(args):
+    import random
+    import re
+    import advice
+
+    rnd = random.Random(0)
+    # 실제 규칙 + 가짜 카테고리(키워드 2~4글자)로 규칙 표를 키움
+    syllables = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초"
+    rules = json.loads(advice.RULES_PATH.read_text(encoding="utf-8"))["rules"]
+    fake = sorted({"".join(rnd.choices(syllables, k=rnd.randint(2, 4))) for _ in range(args.keywords)})
+    for i in range(0, len(fake), 20):
+        rules.append({"category": f"extra{i // 20}", "keywords": fake[i:i + 20], "responses": ["..."]})
+    total = sum(len(rule["keywords"]) for rule in rules)
+
+    # 예전 방식: 카테고리마다 any(word in text). 처음 걸린 카테고리에서 멈추는 if/elif 와,
+    # 점수를 매기려고 모든 키워드를 다 보는 경우 (글에 아무 키워드도 없을 때와 같은 비용)
+    def first_hit(text):
+        for rule in rules:
+            if any(word in text for word in rule["keywords"]):
+                return rule["category"]
+        return None
+
+    def all_hits(text):
+        return {rule["category"] for rule in rules for word in rule["keywords"] if word in text}
+
+    # 정규식 하나로 묶기 (긴 키워드 먼저): 한 번 훑지만 겹치는 키워드는 못 찾음
+    owner = {}
+    for rule in rules:
+        for word in rule["keywords"]:
+            owner.setdefault(word, rule["category"])
+    pattern = re.compile("|".join(map(re.escape, sorted(owner, key=len, reverse=True))))
+
+    def regex(text):
+        return {owner[m.group()] for m in pattern.finditer(text)}
+
+    book = advice.RuleBook(rules)
+
+    def aho(text):
+        return book.route(text)
+
+    print(f"{len(rules)} categories, {total} keywords, text {args.length} chars")
+    # 키워드가 글 끝에만 있는 경우 (앞 카테고리들은 전부 못 찾고 지나감)
+    texts = ["".join(rnd.choices(syllables + " ", k=args.length)) + " 운세" for _ in range(20)]
+    for name, fn in [("any() chain, first hit", first_hit), ("any() chain, all keywords", all_hits),
+                     ("regex alternation", regex), ("RuleBook.route (Aho-Corasick)", aho),
+                     ("real rules via current_rules()", lambda text: advice.current_rules().route(text))]:
+        samples = []
+        for _ in range(args.repeat):
+            for text in texts:
+                t = time.perf_counter()
+                fn(text)
+                samples.append(time.perf_counter() - t)
+        report(name, samples)
+
+    t = time.perf_counter()
+    advice.RuleBook(rules)
+    print(f"compile rules: {(time.perf_counter() - t) * 1000:.1f} ms (파일이 바뀔 때만)")
+
+    # 라벨 붙은 평가 세트: 정규화 전(소문자 글에서 부분 문자열) vs 지금
+    eval_set = [json.loads(line) for line in Path(args.eval).read_text(encoding="utf-8").splitlines() if line.strip()]
+    real = advice.current_rules()
+    raw = advice.KeywordMatcher({w.lower(): [r["category"]] for r in real.rules.values() for w in r["keywords"]})
+
+    def raw_route(text):
+        scores = {}
+        for word, category in set(raw.find(text.lower())):
+            scores[category] = scores.get(category, 0) + len(word)
+        return max(scores, key=lambda c: (scores[c], -real.rank[c])) if scores else None
+
+    print(f"eval set {args.eval}: {len(eval_set)} questions")
+    for name, fn in [("raw substrings", raw_route), ("normalized + token-aware", real.route)]:
+        wrong = [r for r in eval_set if (fn(r["text"]) or "unknown") != r["label"]]
+        print(f"{name:<32} accuracy {1 - len(wrong) / len(eval_set):6.1%}  "
+              f"wrong: {', '.join(r['text'] for r in wrong[:6])}")
+    for name, cold in [("route, caches cold", True), ("route, caches warm", False)]:
+        samples = []
+        for _ in range(args.repeat):
+            for r in eval_set:
+                if cold:
+                    advice.normalize.cache_clear()
+                    real.cache_clear()
+                t = time.perf_counter()
+                real.route(r["text"])
+                samples.append(time.perf_counter() - t)
+        report(name, samples)
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("storage")
+    p.add_argument("--days", type=int, default=730)
+    p.add_argument("--writes", type=int, default=500)
+    p.set_defaults(func=bench_storage)
+    p = sub.add_parser("xp")
+    p.add_argument("--days", type=int, default=20000)
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_xp)
+    p = sub.add_parser("todos")
+    p.add_argument("--rows", type=int, default=500)
+    p.add_argument("--clicks", type=int, default=200)
+    p.set_defaults(func=bench_todos)
+    p = sub.add_parser("db")
+    p.add_argument("--sessions", type=int, default=16)
+    p.add_argument("--ops", type=int, default=200)
+    p.set_defaults(func=bench_db)
+    p = sub.add_parser("fts")
+    p.add_argument("--rows", type=int, default=100000)
+    p.add_argument("--repeat", type=int, default=10)
+    p.set_defaults(func=bench_fts)
+    p = sub.add_parser("bulk")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--chunksize", type=int, default=50_000)
+    p.set_defaults(func=bench_bulk)
+    p = sub.add_parser("advice")
+    p.add_argument("--keywords", type=int, default=2000)
+    p.add_argument("--length", type=int, default=2000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--eval", default="advice_eval.jsonl")
+    p.set_defaults(func=bench_advice)
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
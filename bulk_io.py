@@ -0,0 +1,200 @@
+# bulk_io.py
+# 공부 기록 대량 가져오기/내보내기 (CSV, Parquet)
+#   python bulk_io.py import study.db studytime data.csv
+#   python bulk_io.py export study.db memos memos.parquet
+#   python bulk_io.py import user_data.json logs logs.csv
+# - 파일은 chunksize 행씩 읽고 써서 메모리는 청크 크기만큼만 쓴다
+# - SQLite: 청크마다 executemany, 전체를 한 트랜잭션으로 (중간에 실패하면 아무것도 안 들어감)
+# - JSON(app.py): 잠금 잡고 읽기 → 전부 반영 → 스냅샷 한 번 쓰기 (저널 op 를 행마다 쓰지 않음)
+#   JSON 은 파일 전체가 메모리에 올라가는 구조라 그 부분은 청크로 줄일 수 없다
+# - Parquet 은 pyarrow 가 있을 때만
+import argparse
+import json
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+
+# 테이블 → 컬럼: 타입 (id 는 내보낼 때만, 가져올 때는 새로 매김)
+TABLES = {
+    "todos": {"task": str, "done": int},
+    "memos": {"title": str, "content": str, "date": str},
+    "books": {"title": str, "subject": str, "thought": str},
+    "schedules": {"date": str, "content": str},
+    "studytime": {"date": str, "hours": int},
+}
+# 같은 날이 다시 들어오면 합산 (앱의 add_study_hours 와 같은 규칙)
+UPSERT = {
+    "studytime": "ON CONFLICT(date) DO UPDATE SET hours = hours + excluded.hours",
+}
+# app.py 의 user_data.json 로그
+LOG_COLUMNS = {"date": str, "study_minutes": int, "habits_completed": list, "notes": str}
+
+# =========================
+# ---- 파일 청크 읽기/쓰기 ----
+# =========================
+def _parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet 파일은 pyarrow 가 설치되어 있어야 읽고 쓸 수 있어요 (pip install pyarrow)")
+    return pq
+
+def read_chunks(path: Path, columns: dict, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    path = Path(path)
+    if path.suffix == ".parquet":
+        pf = _parquet().ParquetFile(path)
+        for batch in pf.iter_batches(batch_size=chunksize, columns=list(columns)):
+            yield _normalize(batch.to_pandas(), columns)
+    else:
+        # 모두 문자열로 읽고 타입은 _normalize 에서 (빈 칸 = 빈 문자열 / 0)
+        for chunk in pd.read_csv(path, usecols=lambda c: c in columns, dtype=str, keep_default_na=False,
+                                 chunksize=chunksize, encoding="utf-8"):
+            yield _normalize(chunk, columns)
+
+def _arrow_schema(columns: dict):
+    import pyarrow as pa
+
+    kinds = {str: pa.string(), int: pa.int64(), list: pa.list_(pa.string())}
+    return pa.schema([(col, kinds[kind]) for col, kind in columns.items()])
+
+def write_chunks(path: Path, chunks: Iterator[pd.DataFrame], columns: dict | None = None) -> int:
+    # Parquet 스키마는 columns(컬럼: 타입) 에서 한 번만 만든다 (없으면 첫 청크 것).
+    # 청크마다 추론하면 한 청크에서 전부 NULL 인 컬럼이 null 타입이 되어 중간에 쓰기가 실패함
+    path = Path(path)
+    written = 0
+    writer = None
+    schema = None
+    try:
+        for i, chunk in enumerate(chunks):
+            if path.suffix == ".parquet":
+                import pyarrow as pa
+                if schema is None and columns is not None:
+                    schema = _arrow_schema(columns)
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                if writer is None:
+                    schema = table.schema
+                    writer = _parquet().ParquetWriter(path, schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False, encoding="utf-8")
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+def _normalize(df: pd.DataFrame, columns: dict) -> pd.DataFrame:
+    for col, kind in columns.items():
+        if col not in df.columns:
+            df[col] = None
+        if kind is int:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+        elif kind is list:
+            df[col] = df[col].map(_as_list)
+        else:
+            df[col] = df[col].fillna("").astype(str)
+    return df[list(columns)]
+
+def _as_list(value) -> list:
+    # CSV 에서는 JSON 문자열 '["운동 30분", ...]', Parquet 에서는 리스트/배열
+    if isinstance(value, str):
+        return json.loads(value) if value.strip() else []
+    return list(value) if value is not None and not isinstance(value, float) else []
+
+def _records(df: pd.DataFrame) -> list[tuple]:
+    # numpy 값 → 파이썬 값 (sqlite3 가 numpy int 를 못 받음)
+    return list(zip(*(df[c].astype(object).tolist() for c in df.columns)))
+
+# =========================
+# ---- SQLite (dsghstudy_app) ----
+# =========================
+def import_sqlite(db_path: Path, table: str, src: Path, chunksize: int = CHUNK_ROWS) -> int:
+    import study_db
+
+    columns = TABLES[table]
+    sql = (f"INSERT INTO {table}({', '.join(columns)}) VALUES({', '.join('?' * len(columns))}) "
+           + UPSERT.get(table, ""))
+    total = 0
+    with study_db.connection(db_path) as conn, conn:
+        for chunk in read_chunks(src, columns, chunksize):
+            conn.executemany(sql, _records(chunk))
+            total += len(chunk)
+    return total
+
+def export_sqlite(db_path: Path, table: str, dst: Path, chunksize: int = CHUNK_ROWS) -> int:
+    import study_db
+
+    columns = ["id", *TABLES[table]]
+    # 청크는 쓰면서 읽으므로 다 쓸 때까지 연결을 빌려 둔다
+    with study_db.connection(db_path) as conn:
+        chunks = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id", conn, chunksize=chunksize)
+        return write_chunks(dst, chunks, {"id": int, **TABLES[table]})
+
+# =========================
+# ---- JSON (app.py) ----
+# =========================
+def import_json(json_path: Path, src: Path, chunksize: int = CHUNK_ROWS) -> int:
+    from storage import JournalStore
+
+    total = 0
+
+    def update(data: dict):
+        nonlocal total
+        logs = data["logs"]
+        for chunk in read_chunks(src, LOG_COLUMNS, chunksize):
+            for day, minutes, habits, notes in _records(chunk):
+                # 날짜 형식이 틀리면 여기서 ValueError → 스냅샷을 쓰기 전이라 파일은 그대로
+                logs.upsert({"date": date.fromisoformat(day.strip()).isoformat(), "study_minutes": minutes,
+                             "habits_completed": habits, "notes": notes})
+            total += len(chunk)
+
+    JournalStore(json_path).rewrite(lambda: {"logs": []}, update)
+    return total
+
+def export_json(json_path: Path, dst: Path, chunksize: int = CHUNK_ROWS) -> int:
+    from storage import JournalStore
+
+    dst = Path(dst)
+    logs = JournalStore(json_path).load(lambda: {"logs": []})["logs"]
+
+    def chunks():
+        rows = logs.to_list()
+        for i in range(0, len(rows), chunksize):
+            df = pd.DataFrame(rows[i:i + chunksize], columns=list(LOG_COLUMNS))
+            if dst.suffix != ".parquet":
+                df["habits_completed"] = df["habits_completed"].map(
+                    lambda x: json.dumps(x if isinstance(x, list) else [], ensure_ascii=False))
+            yield df
+
+    return write_chunks(dst, chunks(), LOG_COLUMNS)
+
+# =========================
+# ---- CLI ----
+# =========================
+def main():
+    parser = argparse.ArgumentParser(description="공부 기록 CSV/Parquet 가져오기·내보내기")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("store", type=Path, help="study.db (SQLite) 또는 user_data.json")
+    parser.add_argument("table", choices=[*TABLES, "logs"], help="SQLite 테이블 이름, JSON 은 logs")
+    parser.add_argument("file", type=Path, help=".csv 또는 .parquet")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if args.store.suffix == ".json":
+        if args.table != "logs":
+            parser.error("JSON 저장소는 logs 만 지원해요")
+        fn = import_json if args.action == "import" else export_json
+        count = fn(args.store, args.file, args.chunksize)
+    else:
+        if args.table == "logs":
+            parser.error("logs 는 JSON 저장소(user_data.json)용이에요")
+        fn = import_sqlite if args.action == "import" else export_sqlite
+        count = fn(args.store, args.table, args.file, args.chunksize)
+    print(f"{args.action}: {count}행 ({args.store} {args.table} ↔ {args.file})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# chart_data.py
+# 그래프에 넘기기 전에 데이터 크기 줄이기
+# 기록 기간이 길면 하루 단위 점을 전부 보내지 않고 일 → 주 → 월 → 년 단위로 묶어서
+# 점 개수가 max_points 를 넘지 않게 한다. 연 단위로도 넘치면 여러 해씩 묶는다.
+# (Vega-Lite 스펙에 데이터가 통째로 실려서 브라우저로 가기 때문에 점 개수가 곧 payload 크기)
+import math
+from datetime import date
+
+import pandas as pd
+
+MAX_POINTS = 180
+
+# (pandas 주기, 라벨, 한 구간의 대략적인 일수)
+FREQS = [("D", "일", 1), ("W-MON", "주", 7), ("MS", "월", 30.4), ("YS", "년", 365.25)]
+
+def pick_freq(first: date, last: date, max_points: int = MAX_POINTS) -> tuple[str, str]:
+    days = (last - first).days + 1
+    for freq, label, span in FREQS:
+        if days / span <= max_points:
+            return freq, label
+    return _years(math.ceil(days / FREQS[-1][2] / max_points))
+
+def _years(n: int) -> tuple[str, str]:
+    return ("YS", "년") if n <= 1 else (f"{n}YS", f"{n}년")
+
+def _coarser(freq: str) -> tuple[str, str]:
+    # 한 단계 큰 단위 (년 다음은 2년, 3년 ...)
+    names = [f for f, _, _ in FREQS]
+    if freq in names[:-1]:
+        freq, label, _ = FREQS[names.index(freq) + 1]
+        return freq, label
+    return _years(int(freq[:-2] or 1) + 1)
+
+def _resample(grouped: pd.DataFrame, freq: str, agg: dict) -> pd.DataFrame:
+    if freq.startswith("W"):
+        return grouped.resample(freq, label="left", closed="left").agg(agg)
+    return grouped.resample(freq).agg(agg)
+
+def downsample(df: pd.DataFrame, agg: dict, x: str = "date",
+               max_points: int = MAX_POINTS) -> tuple[pd.DataFrame, str]:
+    # agg: 컬럼 → 집계 방법 ("sum", "mean", "last" ...)
+    # 돌려주는 값: (줄인 표, 단위 라벨 "일"/"주"/"월"/"년")
+    if df.empty:
+        return df[[x, *agg]], "일"
+    dates = pd.to_datetime(df[x])
+    freq, label = pick_freq(dates.min().date(), dates.max().date(), max_points)
+    if freq == "D":
+        return df[[x, *agg]], label
+    grouped = df[list(agg)].set_axis(dates, axis=0).sort_index()
+    out = _resample(grouped, freq, agg).dropna(how="all")
+    while len(out) > max_points:
+        # 구간 경계 때문에 어림값보다 한두 개 넘칠 수 있음 → 한 단계 크게 다시 묶기
+        freq, label = _coarser(freq)
+        out = _resample(grouped, freq, agg).dropna(how="all")
+    out = out.rename_axis(x).reset_index()
+    return out, label
@@ -9,6 +9,10 @@ import pandas as pd
 import streamlit as st
 import altair as alt
 
+from storage import JournalStore
+from xp_engine import habits_xp
+from timers import ENGINE as TIMERS, new_timer, normalize as normalize_timer
+
 # =========================
 # ---- 기본 설정/상수 -----
 # =========================
@@ -51,12 +55,7 @@ def today_str(d: date | None = None) -> str:
 d = d or date.today()
 return d.isoformat()
 
-def load_data():
-if DATA_FILE.exists():
-try:
-return json.loads(DATA_FILE.read_text(encoding="utf-8"))
-except Exception:
-pass
+def default_data() -> dict:
 # 초기 데이터
 return {
 "user": {"name": "사용자"},
@@ -68,15 +67,28 @@ return {
 "friends": {}
 }
 
+def get_store() -> JournalStore:
+if "store" not in st.session_state:
+st.session_state.store = JournalStore(DATA_FILE)
+return st.session_state.store
+
+def load_data():
+data = get_store().load(default_data, track_changes=True)
+# 예전 타이머({minutes, start_time}) → {elapsed_sec, started_at} (1분 미만도 버리지 않음)
+for t in data.get("timers", []):
+normalize_timer(t)
+return data
+
 def save_data(data: dict):
-DATA_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+# 바뀐 키/날짜만 잠금 + 버전 확인 후 저널에 덧붙임
+get_store().save(data)
 
 def get_logs_df(data: dict) -> pd.DataFrame:
 if not data["logs"]:
 return pd.DataFrame(columns=["date","study_minutes","habits_completed","notes"])
-df = pd.DataFrame(data["logs"])
+df = pd.DataFrame(data["logs"].to_list())
 df["date"] = pd.to_datetime(df["date"]).dt.date
-df["habits_count"] = df["habits_completed"].apply(lambda x: len(x) if isinstance(x,list) else 0)
+df["habits_count"] = df["habits_completed"].str.len().fillna(0).astype(int)
 df["xp_from_study"] = df["study_minutes"].fillna(0) * XP_PER_MINUTE
 df["xp_from_habits"] = 0.0
 return df
@@ -85,14 +97,9 @@ def habit_xp_lookup(habits: list[dict]) -> dict:
 return {h["name"]: float(h.get("xp",0)) for h in habits}
 
 def compute_xp(df: pd.DataFrame, habits: list[dict]) -> pd.DataFrame:
-lookup = habit_xp_lookup(habits)
-def xp_from_habits(lst):
-if not isinstance(lst,list):
-return 0.0
-return sum(lookup.get(name,0.0) for name in lst)
 if df.empty: return df
 df = df.copy()
-df["xp_from_habits"] = df["habits_completed"].apply(xp_from_habits)
+df["xp_from_habits"] = habits_xp(df["habits_completed"],habit_xp_lookup(habits))
 df["xp_total_day"] = df["xp_from_study"] + df["xp_from_habits"]
 df = df.sort_values("date")
 df["xp_cum"] = df["xp_total_day"].cumsum()
@@ -138,18 +145,8 @@ else: hunger=max(0,hunger-min(100,dgap*HUNGER_DECAY_PER_DAY))
 return {"mood_text":mood_text,"emoji":data["pet"].get("emoji","🥚"),"hunger":hunger,"gap":dgap}
 
 def upsert_log(data: dict, log_date: date, study_minutes: int, habits_completed: list[str], notes: str):
-logs = data["logs"]
 dstr = log_date.isoformat()
-found=False
-for row in logs:
-if row["date"]==dstr:
-row["study_minutes"]=int(study_minutes)
-row["habits_completed"]=habits_completed
-row["notes"]=notes
-found=True
-break
-if not found:
-logs.append({"date":dstr,"study_minutes":int(study_minutes),"habits_completed":habits_completed,"notes":notes})
+data["logs"].upsert({"date":dstr,"study_minutes":int(study_minutes),"habits_completed":habits_completed,"notes":notes})
 if (study_minutes>0) or (len(habits_completed)>0):
 data["pet"]["last_active"]=dstr
 data["pet"]["hunger"]=min(100,int(data["pet"].get("hunger",80))+HUNGER_GAIN_PER_ACTIVITY)
@@ -339,11 +336,9 @@ st.dataframe(show,use_container_width=True,height=380)
 st.markdown("##### 🗑 특정 날짜 삭제")
 del_date=st.date_input("삭제할 날짜 선택",value=today,max_value=today,key="delete_date")
 if st.button("삭제 실행"):
-before=len(data["logs"])
-data["logs"]=[r for r in data["logs"] if r["date"]!=del_date.isoformat()]
-after=len(data["logs"])
+removed=data["logs"].delete(del_date.isoformat())
 save_data(data)
-if after<before: st.success(f"{del_date.isoformat()} 기록 삭제됨")
+if removed is not None: st.success(f"{del_date.isoformat()} 기록 삭제됨")
 else: st.warning("해당 날짜 기록 없음")
 st.experimental_rerun()
 
@@ -355,31 +350,26 @@ st.subheader("⏱ 과목별 타이머")
 timer_title=st.text_input("타이머 이름/과목")
 if st.button("➕ 타이머 추가"):
 if timer_title.strip():
-tid=str(uuid.uuid4())
-data["timers"].append({"id":tid,"title":timer_title,"minutes":0,"running":False,"start_time":None})
+data["timers"].append(new_timer(timer_title))
 save_data(data)
 st.experimental_rerun()
 for t in data["timers"]:
-st.markdown(f"**{t['title']}** ({t['minutes']}분)")
+st.markdown(f"**{t['title']}** ({int(TIMERS.elapsed(t) // 60)}분)")
 col1,col2,col3=st.columns([1,1,1])
 with col1:
 if st.button(f"▶ 시작 {t['id']}"):
-t["running"]=True
-t["start_time"]=datetime.now().isoformat()
+if TIMERS.start(t):
 save_data(data)
 st.experimental_rerun()
 with col2:
 if st.button(f"⏸ 중지 {t['id']}"):
-if t["running"]:
-delta=(datetime.now()-datetime.fromisoformat(t["start_time"])).total_seconds()/60
-t["minutes"]+=int(delta)
-t["running"]=False
-t["start_time"]=None
+if TIMERS.pause(t):
 save_data(data)
 st.experimental_rerun()
 with col3:
 if st.button(f"🗑 삭제 {t['id']}"):
 data["timers"]=[x for x in data["timers"] if x["id"]!=t["id"]]
+TIMERS.forget(t["id"])
 save_data(data)
 st.experimental_rerun()
 
@@ -396,12 +386,12 @@ st.experimental_rerun()
 colx,coly=st.columns(2)
 with colx:
 if st.button("🔄 오늘만 초기화"):
-data["logs"]=[r for r in data["logs"] if r["date"]!=today_str()]
+data["logs"].delete(today_str())
 save_data(data)
 st.experimental_rerun()
 with coly:
 if st.button("🧹 전체 초기화"):
-DATA_FILE.unlink(missing_ok=True)
+get_store().reset()
 st.session_state.pop("data",None)
 st.experimental_rerun()
 
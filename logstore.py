@@ -0,0 +1,77 @@
+# logstore.py
+# 날짜(YYYY-MM-DD) → 로그 row 인덱스
+# data["logs"] 를 리스트 대신 이걸로 들고 다니면
+#  - get / upsert : dict 조회라 O(1)
+#  - delete       : dict O(1) + 정렬된 날짜 배열에서 bisect
+#  - range        : bisect 로 시작/끝 위치 찾아서 그 구간만
+# 저장할 때는 to_list() 로 예전과 같은 리스트(날짜순)로 내보낸다.
+# subscribe() 로 등록한 함수는 upsert/delete 때마다 (date, row 또는 None)으로 불린다.
+from bisect import bisect_left, bisect_right, insort
+
+class LogStore:
+    def __init__(self, rows=()):
+        self._rows = {}    # date -> row
+        self._dates = []   # 정렬된 date 문자열
+        self._listeners = []
+        for row in rows:
+            self.upsert(row)
+
+    def __getstate__(self):
+        # deepcopy/pickle 때 구독자는 따라가지 않게
+        state = self.__dict__.copy()
+        state["_listeners"] = []
+        return state
+
+    def subscribe(self, fn):
+        self._listeners.append(fn)
+
+    def _notify(self, dstr: str, row: dict | None):
+        for fn in self._listeners:
+            fn(dstr, row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, dstr: str) -> bool:
+        return dstr in self._rows
+
+    def __iter__(self):
+        # 날짜 오름차순
+        return (self._rows[d] for d in self._dates)
+
+    def get(self, dstr: str) -> dict | None:
+        return self._rows.get(dstr)
+
+    def upsert(self, row: dict) -> dict:
+        dstr = row["date"]
+        if dstr not in self._rows:
+            # 보통은 오늘 날짜라 맨 뒤에 붙는다
+            if not self._dates or self._dates[-1] < dstr:
+                self._dates.append(dstr)
+            else:
+                insort(self._dates, dstr)
+        self._rows[dstr] = row
+        self._notify(dstr, row)
+        return row
+
+    def delete(self, dstr: str) -> dict | None:
+        row = self._rows.pop(dstr, None)
+        if row is not None:
+            del self._dates[bisect_left(self._dates, dstr)]
+            self._notify(dstr, None)
+        return row
+
+    def range(self, start: str | None = None, end: str | None = None) -> list[dict]:
+        # start <= date <= end (양끝 포함, None 이면 제한 없음)
+        lo = 0 if start is None else bisect_left(self._dates, start)
+        hi = len(self._dates) if end is None else bisect_right(self._dates, end)
+        return [self._rows[d] for d in self._dates[lo:hi]]
+
+    def first_date(self) -> str | None:
+        return self._dates[0] if self._dates else None
+
+    def last_date(self) -> str | None:
+        return self._dates[-1] if self._dates else None
+
+    def to_list(self) -> list[dict]:
+        return list(self)
@@ -1,5 +1,7 @@
 import streamlit as st
-import random
+
+# 조언 함수와 키워드 라우팅(한 번 훑기 매칭)은 advice.py
+from advice import cache_stats, route_and_reply
 
 # --------------------
 # 페이지 설정 + 전체 어두운 배경
@@ -46,69 +48,23 @@ st.subheader("고민을 입력하고 버튼 하나로 점지 받아보자 ✨")
 # --------------------
 user_text = st.text_area("💬 고민을 적어주세요", placeholder="예: 새벽 3시인데 불닭 먹어도 될까?")
 
-# --------------------
-# 고민 유형별 조언 함수
-# --------------------
-def advise_food(text):
-    return "늦은 밤 매운 음식은 피부에 안 좋아. 체중도 조금 늘 수 있어."
-
-def advise_study(text):
-    return "25분 집중 + 5분 휴식 포모도로 방법 추천! 작은 목표부터 끝내자."
-
-def advise_love(text):
-    return "솔직하게 작은 제안부터 시작해봐. 반응 없으면 속도 줄이기."
-
-def advise_weather(text):
-    return "오늘은 비가 올 수 있어. 우산 챙기고, 옷은 따뜻하게 입어!"
-
-def advise_fashion(text):
-    if "빨간 블라우스" in text:
-        return "빨간 블라우스엔 검정 바지나 흰색 바지가 제일 무난해."
-    elif "청바지" in text:
-        return "청바지엔 흰색이나 파스텔톤 상의가 잘 어울려."
-    else:
-        return "무난한 색(검정, 흰색, 회색)이면 대부분 잘 어울려."
-
-def advise_late(text):
-    return "지금 남은 시간으로 전력질주하면 도착 가능. 천천히 가면 늦을 수 있어."
-
-def advise_fortune(text):
-    fortunes = [
-        "오늘은 새로운 시작을 해보기 좋은 날!",
-        "조금 조심하는 게 좋아, 특히 사람 사이에서.",
-        "뜻밖의 행운이 찾아올 수도 있어.",
-        "작은 실수를 크게 만들지 않도록 주의!"
-    ]
-    return random.choice(fortunes)
-
-# --------------------
-# 라우팅 함수
-# --------------------
-def route_and_reply(text: str):
-    text = text.lower()
-    if any(word in text for word in ["불닭", "야식", "라면"]):
-        return advise_food(text)
-    elif any(word in text for word in ["공부", "시험"]):
-        return advise_study(text)
-    elif any(word in text for word in ["좋아하는 사람", "연애", "고백"]):
-        return advise_love(text)
-    elif any(word in text for word in ["날씨", "비", "우산"]):
-        return advise_weather(text)
-    elif any(word in text for word in ["바지", "옷", "블라우스", "코디"]):
-        return advise_fashion(text)
-    elif any(word in text for word in ["학교", "지각", "늦"]):
-        return advise_late(text)
-    elif any(word in text for word in ["운세", "점"]):
-        return advise_fortune(text)
-    else:
-        return "마법사가 그 고민은 아직 잘 모르겠어. 조금 더 구체적으로 말해줘!"
+# 같은 이름이면 오늘 하루 같은 운세
+user_name = st.text_input("🙋 이름 (선택)", placeholder="이름을 적으면 오늘의 운세가 하루 동안 고정돼요")
 
 # --------------------
 # 버튼 클릭 시 답변
 # --------------------
 if st.button("점지 받기 ✨"):
     if user_text.strip():
-        advice = route_and_reply(user_text)
+        advice = route_and_reply(user_text, user_name.strip())
         st.markdown(f"<div class='bubble'><b>🔮 조언:</b> {advice}</div>", unsafe_allow_html=True)
     else:
         st.warning("고민을 입력해야 점지를 받을 수 있어!")
+
+# --------------------
+# 라우팅 캐시 적중률
+# --------------------
+with st.expander("📈 마법사 캐시"):
+    stats = cache_stats()["route"]
+    st.caption(f"같은 질문 재사용 {stats['hits']}번 / 새로 계산 {stats['misses']}번 "
+               f"(적중률 {stats['hit_rate']:.0%}, 저장된 질문 {stats['size']}개)")
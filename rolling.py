@@ -0,0 +1,86 @@
+# rolling.py
+# 최근 N일 (기본 7/30/90일) 합계/개수를 미리 모아두는 구조
+# 날짜별 버킷(공부 분, 완료 습관 수)을 두고, 창마다 합계를 들고 있다가
+#  - 로그가 바뀌면 그 날짜가 들어있는 창에만 차이(delta)를 더하고
+#  - 날짜가 넘어가면 빠지는 날/들어오는 날 버킷만 빼고 더한다
+# 그래서 sum/count/mean 조회는 O(1).
+# 개수(count)는 "기록이 있는 날 수" = 예전 df[df.date >= ...].mean() 과 같은 기준.
+from datetime import date, timedelta
+
+from logstore import LogStore
+
+FIELDS = ("study_minutes", "habits_count")
+
+def _bucket(row: dict | None) -> tuple[int, int, int]:
+    # (공부 분, 습관 수, 기록 여부)
+    if row is None:
+        return (0, 0, 0)
+    habits = row.get("habits_completed")
+    return (int(row.get("study_minutes") or 0), len(habits) if isinstance(habits, list) else 0, 1)
+
+class RollingWindows:
+    def __init__(self, logs: LogStore, windows=(7, 30, 90), today: date | None = None):
+        self.logs = logs
+        self.windows = tuple(sorted(windows))
+        self.buckets = {}  # date -> (minutes, habits, 1)
+        for row in logs:
+            self.buckets[date.fromisoformat(row["date"])] = _bucket(row)
+        self._rebuild(today or date.today())
+        logs.subscribe(self.on_change)
+
+    def _rebuild(self, today: date):
+        self.today = today
+        self.sums = {w: [0, 0, 0] for w in self.windows}
+        for w in self.windows:
+            start = today - timedelta(days=w - 1)
+            for row in self.logs.range(start.isoformat(), today.isoformat()):
+                self._add(self.sums[w], self.buckets[date.fromisoformat(row["date"])], 1)
+
+    @staticmethod
+    def _add(acc: list, bucket: tuple, sign: int):
+        for i, v in enumerate(bucket):
+            acc[i] += sign * v
+
+    def _in_window(self, d: date, w: int) -> bool:
+        return self.today - timedelta(days=w - 1) <= d <= self.today
+
+    # ---- 갱신 ----
+    def on_change(self, dstr: str, row: dict | None):
+        d = date.fromisoformat(dstr)
+        old = self.buckets.pop(d, (0, 0, 0))
+        new = _bucket(row)
+        if row is not None:
+            self.buckets[d] = new
+        for w in self.windows:
+            if self._in_window(d, w):
+                self._add(self.sums[w], old, -1)
+                self._add(self.sums[w], new, 1)
+
+    def advance(self, today: date):
+        # 날짜가 바뀌면 창을 하루씩 민다 (오래 안 열었으면 그냥 다시 계산)
+        if today == self.today:
+            return
+        if today < self.today or (today - self.today).days > self.windows[-1]:
+            self._rebuild(today)
+            return
+        while self.today < today:
+            self.today += timedelta(days=1)
+            for w in self.windows:
+                leaving = self.today - timedelta(days=w)
+                self._add(self.sums[w], self.buckets.get(leaving, (0, 0, 0)), -1)
+                self._add(self.sums[w], self.buckets.get(self.today, (0, 0, 0)), 1)
+
+    # ---- 조회 (O(1)) ----
+    def _get(self, window: int, today: date | None) -> list:
+        self.advance(today or date.today())
+        return self.sums[window]
+
+    def total(self, window: int, field: str, today: date | None = None) -> int:
+        return self._get(window, today)[FIELDS.index(field)]
+
+    def count(self, window: int, today: date | None = None) -> int:
+        return self._get(window, today)[2]
+
+    def mean(self, window: int, field: str, today: date | None = None) -> float:
+        acc = self._get(window, today)
+        return acc[FIELDS.index(field)] / acc[2] if acc[2] else 0.0
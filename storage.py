@@ -0,0 +1,332 @@
+# storage.py
+# user_data.json 저널링 저장소
+#  - user_data.json  : 스냅샷 (기존 포맷 + "_version")
+#  - user_data.jsonl : 스냅샷 이후의 변경 기록. 첫 줄은 {"base": 스냅샷 버전},
+#                      그 다음부터 한 줄에 op 하나 ({"v": 버전, "op": ...})
+#  - user_data.lock  : 여러 세션/탭이 동시에 쓸 때 쓰는 잠금 파일
+# 클릭할 때마다 전체 파일을 다시 쓰지 않고 바뀐 부분만 한 줄 덧붙인다.
+# 저널이 COMPACT_BYTES 를 넘으면 스냅샷으로 합치고(compaction) 저널을 비운다.
+#
+# 동시성: 쓰기 전에 잠금을 잡고, 내가 마지막으로 본 버전 이후에 다른 세션이
+# 덧붙인 op가 있으면 먼저 내 data에 반영(merge)한 뒤 내 op를 다시 얹어서 쓴다.
+# 그래서 두 탭이 서로의 기록을 덮어쓰지 않는다 (같은 항목은 나중에 쓴 쪽이 이김).
+#
+# 크래시: 스냅샷은 임시 파일 + fsync + rename 으로만 교체하고,
+# 저널의 끊긴 마지막 줄은 읽을 때 버린다.
+import copy
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from logstore import LogStore
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+COMPACT_BYTES = 256 * 1024
+FSYNC = True  # 저널 append 마다 fsync (전원 차단까지 대비)
+
+# =========================
+# ---- 변경 기록(op) ------
+# =========================
+def op_set(key: str, value) -> dict:
+    # 최상위 키 통째로 교체 (user, habits, pet, timer_defs ...)
+    return {"op": "set", "key": key, "value": value}
+
+def op_upsert_log(row: dict) -> dict:
+    # 해당 날짜의 로그 한 줄을 통째로 덮어쓰기
+    return {"op": "upsert_log", "row": row}
+
+def op_delete_log(dstr: str) -> dict:
+    return {"op": "delete_log", "date": dstr}
+
+def op_upsert_item(key: str, item: dict) -> dict:
+    # id 가 있는 dict 리스트(timer_defs 등)에서 항목 하나만 교체/추가
+    # → 두 세션이 서로 다른 타이머를 건드려도 덮어쓰지 않는다
+    return {"op": "upsert_item", "key": key, "item": item}
+
+def op_delete_item(key: str, item_id: str) -> dict:
+    return {"op": "delete_item", "key": key, "id": item_id}
+
+def replay(data: dict, ops: list[dict]) -> dict:
+    # 메모리에서는 data["logs"] 를 LogStore(날짜 인덱스)로 들고 있는다
+    if not isinstance(data.get("logs"), LogStore):
+        data["logs"] = LogStore(data.get("logs") or [])
+    logs = data["logs"]
+    for op in ops:
+        kind = op.get("op")
+        if kind == "set":
+            if op["key"] == "logs":
+                logs = data["logs"] = LogStore(op["value"])
+            else:
+                data[op["key"]] = op["value"]
+        elif kind == "upsert_log":
+            logs.upsert(op["row"])
+        elif kind == "delete_log":
+            logs.delete(op["date"])
+        elif kind == "upsert_item":
+            items = data.setdefault(op["key"], [])
+            for i, item in enumerate(items):
+                if item.get("id") == op["item"]["id"]:
+                    items[i] = op["item"]
+                    break
+            else:
+                items.append(op["item"])
+        elif kind == "delete_item":
+            data[op["key"]] = [x for x in data.get(op["key"], []) if x.get("id") != op["id"]]
+    return data
+
+def diff_ops(old: dict, new: dict) -> list[dict]:
+    # 통째로 저장하는 코드(last.py)를 위해: 두 상태를 비교해서 op 목록 만들기
+    ops = []
+    for key, value in new.items():
+        if key == "logs":
+            continue
+        if key not in old or old[key] != value:
+            ops.append(op_set(key, value))
+    old_logs = {row["date"]: row for row in old.get("logs") or []}
+    new_logs = {row["date"]: row for row in new.get("logs") or []}
+    for dstr, row in new_logs.items():
+        if old_logs.get(dstr) != row:
+            ops.append(op_upsert_log(row))
+    for dstr in old_logs.keys() - new_logs.keys():
+        ops.append(op_delete_log(dstr))
+    return ops
+
+# =========================
+# ---- 파일 유틸 ----------
+# =========================
+def _json_default(obj):
+    # LogStore 는 예전 포맷 그대로 리스트로 저장
+    if isinstance(obj, LogStore):
+        return obj.to_list()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+def _dumps_line(obj: dict) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_json_default) + "\n").encode("utf-8")
+
+def atomic_write_text(path: Path, text: str):
+    # 같은 폴더에 임시 파일을 쓰고 fsync 후 rename → 중간에 죽어도 반쪽 파일이 안 남음
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+@contextmanager
+def file_lock(path: Path):
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+# =========================
+# ---- 저장소 -------------
+# =========================
+class JournalStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".jsonl")
+        self.lock_path = self.path.with_suffix(".lock")
+        self.base = 0       # 내가 읽은 스냅샷 버전
+        self.version = 0    # 내가 반영한 마지막 op 버전
+        self.offset = 0     # 저널에서 읽은 위치(byte)
+        self.recovered_from = None  # 깨진 스냅샷을 옮겨둔 경로 (있으면 UI에서 경고)
+        self.default_factory = dict
+        self._shadow = None  # save() 용: 마지막으로 저장된 상태
+
+    # ---- 읽기 ----
+    def _journal_base(self) -> int | None:
+        try:
+            with self.journal_path.open("rb") as f:
+                return json.loads(f.readline()).get("base")
+        except (OSError, ValueError):
+            return None
+
+    def _read_tail(self, f, start: int) -> tuple[list[dict], int]:
+        # start 부터 끝까지 읽어서 (op 목록, 마지막 완전한 줄의 끝 위치)
+        f.seek(start)
+        chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        ops = []
+        for line in chunk[:end].splitlines():
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue
+            if "op" in op:
+                ops.append(op)
+        return ops, start + end
+
+    def _load_unlocked(self, default_factory) -> dict:
+        data = None
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                # 조용히 기본값으로 덮어쓰지 않고 깨진 파일은 따로 보관
+                backup = self.path.with_name(f"{self.path.name}.corrupt-{int(time.time())}")
+                os.replace(self.path, backup)
+                self.recovered_from = backup
+                data = None
+        if data is None:
+            data = default_factory()
+        self.base = int(data.pop("_version", 0))
+        self.version = self.base
+        self.offset = 0
+        ops = []
+        if self.journal_path.exists():
+            with self.journal_path.open("rb") as f:
+                raw_ops, self.offset = self._read_tail(f, 0)
+            for op in raw_ops:
+                v = op.get("v", self.version + 1)
+                if v > self.version:  # 스냅샷에 이미 합쳐진 op는 건너뛰기
+                    ops.append(op)
+                    self.version = v
+        return replay(data, ops)
+
+    def load(self, default_factory, track_changes: bool = False) -> dict:
+        # track_changes: save()로 통째 저장할 코드라면 비교용 사본을 남겨둔다
+        self.default_factory = default_factory
+        with file_lock(self.lock_path):
+            data = self._load_unlocked(default_factory)
+        if track_changes:
+            self._shadow = copy.deepcopy(data)
+        return data
+
+    # ---- 쓰기 ----
+    def _pull_unlocked(self, data: dict, ops: list[dict] = ()) -> bool:
+        # 다른 세션이 쓴 변경을 data 에 반영하고 그 위에 내 op(있으면)를 다시 얹는다
+        if self._journal_base() not in (self.base, None) or (
+                not self.journal_path.exists() and self.offset):
+            # 다른 세션이 compaction 함 → 디스크 상태를 새로 읽고 내 op를 얹기
+            fresh = self._load_unlocked(self.default_factory)
+            replay(fresh, ops)
+            data.clear()
+            data.update(fresh)
+            return True
+        if not self.journal_path.exists():
+            return False
+        with self.journal_path.open("r+b") as f:
+            remote, end = self._read_tail(f, self.offset)
+            f.truncate(end)  # 끊긴 마지막 줄 정리
+        remote = [op for op in remote if op.get("v", 0) > self.version]
+        if remote:
+            # 다른 세션이 먼저 쓴 변경 반영 후 내 변경을 다시 얹기
+            replay(data, remote + list(ops))
+            self.version = max(op["v"] for op in remote)
+        self.offset = end
+        return bool(remote)
+
+    def refresh(self, data: dict) -> bool:
+        # 쓰지 않고 다른 세션(탭)의 변경만 받아온다. 바뀐 게 있으면 True
+        with file_lock(self.lock_path):
+            return self._pull_unlocked(data)
+
+    def append(self, data: dict, ops: list[dict]):
+        # data 를 이미 바꾼 뒤에 부르는 쓰기. 다른 세션이 같은 행을 그 사이에 바꿨으면
+        # 내 행이 통째로 이긴다 → 더하기처럼 최신 값을 읽고 쓰는 변경은 update() 로
+        if not ops:
+            return
+        with file_lock(self.lock_path):
+            self._pull_unlocked(data, ops)
+            self._write_unlocked(data, ops)
+
+    def update(self, data: dict, fn) -> list[dict]:
+        # 잠금을 잡은 채로 다른 세션의 변경을 먼저 받아온 다음 fn(data) 를 부른다.
+        # fn 은 data 를 고치고 그 op 목록을 돌려준다 → 읽고-고치고-쓰기 사이에 끼어드는 세션이 없음
+        # (두 탭이 같은 날에 30분, 45분을 더하면 75분)
+        with file_lock(self.lock_path):
+            self._pull_unlocked(data)
+            ops = list(fn(data) or [])
+            if ops:
+                self._write_unlocked(data, ops)
+        return ops
+
+    def _write_unlocked(self, data: dict, ops: list[dict]):
+        lines = []
+        if not self.journal_path.exists() or self.offset == 0:
+            lines.append(_dumps_line({"base": self.base}))
+        for op in ops:
+            self.version += 1
+            lines.append(_dumps_line({"v": self.version, **op}))
+        with self.journal_path.open("ab") as f:
+            f.write(b"".join(lines))
+            f.flush()
+            if FSYNC:
+                os.fsync(f.fileno())
+            self.offset = f.tell()
+        if self.offset >= COMPACT_BYTES:
+            self._compact_unlocked(data)
+
+    def save(self, data: dict):
+        # 변경 부분을 모르는 코드용: 마지막 저장 상태와 비교해서 바뀐 것만 append
+        ops = diff_ops(self._shadow or {}, data)
+        self.append(data, ops)
+        self._shadow = copy.deepcopy(data)
+
+    def _compact_unlocked(self, data: dict):
+        # 현재 상태를 스냅샷으로 쓰고 저널 비우기
+        snapshot = dict(data, _version=self.version)
+        atomic_write_text(self.path, json.dumps(snapshot, ensure_ascii=False, indent=2, default=_json_default))
+        self.base = self.version
+        atomic_write_text(self.journal_path, _dumps_line({"base": self.base}).decode("utf-8"))
+        self.offset = self.journal_path.stat().st_size
+
+    def compact(self, data: dict):
+        with file_lock(self.lock_path):
+            self._compact_unlocked(data)
+
+    def rewrite(self, default_factory, update) -> dict:
+        # 잠금을 잡은 채로 최신 상태를 읽고 update(data) 후 스냅샷 한 번으로 저장 (대량 가져오기용)
+        # update 가 예외를 내면 아무것도 쓰지 않는다
+        self.default_factory = default_factory
+        with file_lock(self.lock_path):
+            data = self._load_unlocked(default_factory)
+            update(data)
+            self.version += 1  # 다른 세션이 base 변화를 보고 다시 읽도록
+            self._compact_unlocked(data)
+        return data
+
+    def reset(self):
+        # 기본 데이터로 초기화. 버전은 0으로 되돌리지 않고 이어서 올린다
+        # (다른 세션이 바뀐 걸 알아채고, 버전을 키로 쓰는 캐시가 섞이지 않게)
+        with file_lock(self.lock_path):
+            self._load_unlocked(self.default_factory)
+            data = replay(self.default_factory(), [])
+            self.version += 1
+            self._compact_unlocked(data)
+        self._shadow = None
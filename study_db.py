@@ -0,0 +1,398 @@
+# study_db.py
+# dsghstudy_app 용 SQLite 연결/스키마 관리
+#  - 연결은 파일마다 크기가 정해진 풀에서 빌려 쓰고 돌려준다 (with connection() as conn:)
+#    Streamlit 은 rerun 마다 새 스레드에서 스크립트를 돌리므로 스레드별 연결은 매번 새로 열리고
+#    PRAGMA 를 다시 돌린다 → 풀에 모아 두고 재사용. 빌린 동안은 한 곳만 쓰니 트랜잭션이 섞이지 않음
+#  - WAL 모드: 읽기는 쓰기를 기다리지 않고, 쓰기끼리만 순서대로
+#  - 스키마는 PRAGMA user_version 으로 버전 관리, 파일마다 한 번만 올린다
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+DB_PATH = Path("study.db")
+
+BUSY_TIMEOUT_MS = 5000   # 다른 연결이 쓰는 중이면 이만큼 기다렸다가 재시도
+CACHE_SIZE_KB = 8 * 1024  # 연결당 페이지 캐시 (음수 PRAGMA = KiB 단위)
+POOL_SIZE = 8             # 파일당 최대 연결 수. 다 빌려 가면 하나 돌아올 때까지 기다림
+
+# 연속된 날짜끼리 묶기 (gaps-and-islands): 날짜 - 순번 이 같으면 같은 구간
+RUNS_SQL = """
+SELECT MIN(date), MAX(date), COUNT(*) FROM (
+    SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS grp FROM studytime
+) GROUP BY grp
+"""
+
+# 버전 n 으로 올리는 SQL 문들 (MIGRATIONS[n - 1])
+# 예전 앱이 매번 CREATE TABLE IF NOT EXISTS 하던 테이블이 1번 → 기존 파일도 그대로 채택됨
+MIGRATIONS = [
+    (
+        """CREATE TABLE IF NOT EXISTS todos(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task TEXT,
+        done INTEGER
+        )""",
+        """CREATE TABLE IF NOT EXISTS memos(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        content TEXT,
+        date TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS books(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        subject TEXT,
+        thought TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS studytime(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT,
+        hours INTEGER
+        )""",
+    ),
+    # 2: 날짜 기준 조회용 스키마
+    #  - studytime: 하루 한 행 (UNIQUE date → 인덱스 겸용), 같은 날 기록은 합쳐서 옮김
+    #  - 날짜는 'YYYY-MM-DD' TEXT 로 통일 (CHECK) → 문자열 정렬/범위 비교가 곧 날짜 비교
+    #  - memos: date 인덱스
+    (
+        """CREATE TABLE studytime_v2(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL UNIQUE CHECK(date IS date(date)),
+        hours INTEGER NOT NULL DEFAULT 0 CHECK(hours >= 0)
+        )""",
+        """INSERT INTO studytime_v2(date, hours)
+        SELECT date(date), SUM(COALESCE(hours, 0)) FROM studytime
+        WHERE date(date) IS NOT NULL
+        GROUP BY date(date)""",
+        "DROP TABLE studytime",
+        "ALTER TABLE studytime_v2 RENAME TO studytime",
+        "CREATE INDEX IF NOT EXISTS memos_date ON memos(date)",
+    ),
+    # 3: 연속 공부 구간(run) 테이블 — 스트릭을 O(log n) 으로
+    #  - 기존 기록은 gaps-and-islands 로 한 번에 채우고
+    #  - 이후엔 studytime 트리거가 새 날짜를 앞/뒤 구간과 이어 붙인다 (삭제는 구간을 쪼갬)
+    (
+        """CREATE TABLE study_runs(
+        start TEXT PRIMARY KEY,
+        end TEXT NOT NULL,
+        len INTEGER NOT NULL
+        )""",
+        "CREATE INDEX study_runs_end ON study_runs(end)",
+        "CREATE INDEX study_runs_len ON study_runs(len)",
+        f"INSERT INTO study_runs(start, end, len) {RUNS_SQL}",
+        """CREATE TRIGGER studytime_runs_insert AFTER INSERT ON studytime BEGIN
+            INSERT OR REPLACE INTO study_runs(start, end, len)
+            SELECT s, e, julianday(e) - julianday(s) + 1 FROM (SELECT
+                COALESCE((SELECT start FROM study_runs WHERE end = date(NEW.date, '-1 day')), NEW.date) AS s,
+                COALESCE((SELECT end FROM study_runs WHERE start = date(NEW.date, '+1 day')), NEW.date) AS e);
+            DELETE FROM study_runs WHERE start = date(NEW.date, '+1 day');
+        END""",
+        """CREATE TRIGGER studytime_runs_delete AFTER DELETE ON studytime BEGIN
+            INSERT INTO study_runs(start, end, len)
+            SELECT date(OLD.date, '+1 day'), end, julianday(end) - julianday(OLD.date)
+            FROM study_runs WHERE start <= OLD.date AND end > OLD.date;
+            UPDATE study_runs SET end = date(OLD.date, '-1 day'), len = julianday(OLD.date) - julianday(start)
+            WHERE start < OLD.date AND end >= OLD.date;
+            DELETE FROM study_runs WHERE start = OLD.date;
+        END""",
+    ),
+    # 4: 메모/독서 전문 검색 (FTS5, trigram 토크나이저)
+    #  - 한국어는 띄어쓰기/조사 때문에 단어 토큰화가 잘 안 맞아서 3글자 조각(trigram) 단위로 색인
+    #  - 본문은 원래 테이블에 두고(external content) 트리거로 색인만 맞춘다
+    (
+        """CREATE VIRTUAL TABLE memos_fts USING fts5(
+        title, content, content='memos', content_rowid='id', tokenize='trigram'
+        )""",
+        """CREATE TRIGGER memos_fts_insert AFTER INSERT ON memos BEGIN
+            INSERT INTO memos_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END""",
+        """CREATE TRIGGER memos_fts_delete AFTER DELETE ON memos BEGIN
+            INSERT INTO memos_fts(memos_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END""",
+        """CREATE TRIGGER memos_fts_update AFTER UPDATE ON memos BEGIN
+            INSERT INTO memos_fts(memos_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO memos_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END""",
+        "INSERT INTO memos_fts(memos_fts) VALUES ('rebuild')",
+        """CREATE VIRTUAL TABLE books_fts USING fts5(
+        title, subject, thought, content='books', content_rowid='id', tokenize='trigram'
+        )""",
+        """CREATE TRIGGER books_fts_insert AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts(rowid, title, subject, thought) VALUES (new.id, new.title, new.subject, new.thought);
+        END""",
+        """CREATE TRIGGER books_fts_delete AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, title, subject, thought) VALUES ('delete', old.id, old.title, old.subject, old.thought);
+        END""",
+        """CREATE TRIGGER books_fts_update AFTER UPDATE ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, title, subject, thought) VALUES ('delete', old.id, old.title, old.subject, old.thought);
+            INSERT INTO books_fts(rowid, title, subject, thought) VALUES (new.id, new.title, new.subject, new.thought);
+        END""",
+        "INSERT INTO books_fts(books_fts) VALUES ('rebuild')",
+    ),
+    # 5: 일정 전용 테이블
+    #  - 예전 일정 페이지는 memos 에 title='일정' 으로 넣기만 했음 → 옮기고 memos 에서는 지움
+    (
+        """CREATE TABLE schedules(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL CHECK(date IS date(date)),
+        content TEXT NOT NULL
+        )""",
+        "CREATE INDEX schedules_date ON schedules(date)",
+        """INSERT INTO schedules(date, content)
+        SELECT date(date), COALESCE(content, '') FROM memos
+        WHERE title = '일정' AND date(date) IS NOT NULL ORDER BY id""",
+        "DELETE FROM memos WHERE title = '일정' AND date(date) IS NOT NULL",
+    ),
+]
+
+def _open(path: Path) -> sqlite3.Connection:
+    # 풀에서 여러 스레드를 옮겨 다니므로 check_same_thread=False (한 번에 한 스레드만 빌림)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL 에서는 NORMAL 이어도 손상 없음 (마지막 커밋만 잃을 수 있음)
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+def migrate(conn: sqlite3.Connection, migrations: list = MIGRATIONS) -> int:
+    # 모자란 버전만 순서대로 적용. 여러 프로세스가 동시에 와도 BEGIN IMMEDIATE 로 한 곳만 진행
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    if current >= len(migrations):
+        return current
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+        for version in range(current + 1, len(migrations) + 1):
+            for stmt in migrations[version - 1]:
+                conn.execute(stmt)
+            conn.execute(f"PRAGMA user_version={version}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return len(migrations)
+
+class ConnectionPool:
+    # 파일 하나의 연결 풀. 연결은 필요할 때 size 개까지만 열고(PRAGMA 는 열 때 한 번),
+    # 돌려받은 건 다음 사람이 그대로 쓴다. 스키마 확인은 풀을 만들 때 한 번
+    def __init__(self, path: Path, migrations: list = MIGRATIONS, size: int = POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue()  # 최근에 쓴 연결부터 (페이지 캐시가 따뜻함)
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.opened = 0  # 지금까지 연 연결 수 (재사용이 되는지 확인용)
+        conn = self._new()
+        try:
+            migrate(conn, migrations)
+        except BaseException:
+            conn.close()
+            raise
+        self._idle.put(conn)
+
+    def _new(self) -> sqlite3.Connection:
+        conn = _open(self.path)
+        with self._lock:
+            self.opened += 1
+        return conn
+
+    @contextmanager
+    def connection(self):
+        # 빌린 연결. 블록에서 예외가 났거나 커밋 안 한 트랜잭션이 남았으면 롤백하고 돌려준다
+        # → 실패한 쓰기가 쓰기 잠금을 쥔 채로 풀에 돌아가 다른 세션을 막는 일이 없음
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._new()  # 슬롯을 잡았으니 열린 연결 수는 size 를 넘지 않음
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        # 쉬고 있는 연결을 닫는다
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def pool(path: Path | str = DB_PATH, migrations: list = MIGRATIONS) -> ConnectionPool:
+    # 파일마다 풀 하나 (프로세스 공용)
+    # migrations: 다른 스키마를 쓰는 파일(studyapp 저장소 등)은 자기 목록을 넘긴다
+    path = Path(path).resolve()
+    with _pools_lock:
+        p = _pools.get(path)
+        if p is None:
+            p = _pools[path] = ConnectionPool(path, migrations)
+        return p
+
+def connection(path: Path | str = DB_PATH, migrations: list = MIGRATIONS):
+    # with study_db.connection() as conn: ... — 풀에서 빌렸다가 블록이 끝나면 돌려줌
+    return pool(path, migrations).connection()
+
+def close(path: Path | str = DB_PATH):
+    with _pools_lock:
+        p = _pools.pop(Path(path).resolve(), None)
+    if p is not None:
+        p.close()
+
+# =========================
+# ---- 공부 시간 ----------
+# =========================
+def add_study_hours(conn: sqlite3.Connection, day: str, hours: int):
+    # 같은 날 다시 기록하면 행을 늘리지 않고 시간만 더한다
+    with conn:
+        conn.execute(
+            "INSERT INTO studytime(date, hours) VALUES(?, ?) "
+            "ON CONFLICT(date) DO UPDATE SET hours = hours + excluded.hours",
+            (day, hours),
+        )
+
+def study_hours(conn: sqlite3.Connection, start: str | None = None, end: str | None = None) -> list[tuple[str, int]]:
+    # (date, hours) 날짜순. 범위는 date 인덱스로 잘라낸다
+    sql = "SELECT date, hours FROM studytime WHERE date >= ? AND date <= ? ORDER BY date"
+    return conn.execute(sql, (start or "0000-00-00", end or "9999-99-99")).fetchall()
+
+def has_study(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT EXISTS(SELECT 1 FROM studytime)").fetchone()[0] == 1
+
+# =========================
+# ---- 목록 페이지 --------
+# =========================
+PAGE_SIZE = 20
+PAGED_COLUMNS = {
+    "memos": "id, title, content, date",
+    "books": "id, title, subject, thought",
+}
+
+def page(conn: sqlite3.Connection, table: str, before_id: int | None = None,
+         limit: int = PAGE_SIZE) -> list[tuple]:
+    # 키셋 페이지: before_id 보다 작은 id 중 최신 limit 개
+    # OFFSET 처럼 앞 행을 세며 건너뛰지 않고 PK 에서 바로 시작 → 몇 번째 페이지든 같은 비용
+    cols = PAGED_COLUMNS[table]
+    if before_id is None:
+        return conn.execute(f"SELECT {cols} FROM {table} ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    return conn.execute(f"SELECT {cols} FROM {table} WHERE id < ? ORDER BY id DESC LIMIT ?",
+                        (before_id, limit)).fetchall()
+
+# =========================
+# ---- 검색 ---------------
+# =========================
+SEARCH_LIMIT = 50
+RANK_MAX_HITS = 2000  # 일치 행이 이보다 많으면 관련도 대신 최신순
+# 테이블 → (검색 컬럼, bm25 가중치, 결과로 돌려줄 앞쪽 컬럼)
+SEARCH_COLUMNS = {
+    "memos": (("title", "content"), (3.0, 1.0), "m.id, m.title, m.date"),
+    "books": (("title", "subject", "thought"), (3.0, 2.0, 1.0), "m.id, m.title, m.subject"),
+}
+
+def _like(word: str) -> str:
+    return "%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def search(conn: sqlite3.Connection, table: str, query: str, limit: int = SEARCH_LIMIT) -> list[tuple]:
+    # 띄어쓰기로 나눈 단어가 모두 들어간 행, 관련도(bm25) 순. 마지막 컬럼은 일치 부분 발췌
+    #  - 3글자 이상 단어: trigram 색인으로 MATCH
+    #  - 1~2글자 단어(한국어에 흔함): 색인이 못 잡으므로 LIKE 로 거른다
+    #    → 긴 단어가 하나도 없으면 최신순 LIKE 스캔
+    cols, weights, head = SEARCH_COLUMNS[table]
+    words = query.split()
+    long_words = [w for w in words if len(w) >= 3]
+    short_words = [w for w in words if len(w) < 3]
+    where, params = [], []
+    for w in short_words:
+        where.append("(" + " OR ".join(f"m.{c} LIKE ? ESCAPE '\\'" for c in cols) + ")")
+        params += [_like(w)] * len(cols)
+    if long_words:
+        fts = f"{table}_fts"
+        match = " ".join('"' + w.replace('"', '""') + '"' for w in long_words)
+        # bm25 는 일치하는 행 전부에 점수를 매겨야 해서, 너무 흔한 단어면 최신순으로 대신한다
+        hits = conn.execute(f"SELECT count(*) FROM {fts} WHERE {fts} MATCH ?", (match,)).fetchone()[0]
+        order = (f"bm25({fts}, {', '.join(map(str, weights))})" if hits <= RANK_MAX_HITS
+                 else f"{fts}.rowid DESC")
+        rows = conn.execute(
+            f"SELECT {head} FROM {fts} JOIN {table} m ON m.id = {fts}.rowid WHERE {fts} MATCH ? "
+            + "".join(f"AND {cond} " for cond in where) + f"ORDER BY {order} LIMIT ?",
+            [match, *params, limit],
+        ).fetchall()
+        if not rows:
+            return []
+        # 발췌(snippet)는 잘라낸 행에만
+        snippets = dict(conn.execute(
+            f"SELECT rowid, snippet({fts}, -1, '**', '**', '…', 16) FROM {fts} "
+            f"WHERE {fts} MATCH ? AND rowid IN ({', '.join('?' * len(rows))})",
+            [match, *(r[0] for r in rows)],
+        ))
+        return [(*r, snippets.get(r[0], "")) for r in rows]
+    if not where:
+        return []
+    # 발췌 대신 본문(마지막 컬럼) 앞부분
+    sql = (f"SELECT {head}, substr(m.{cols[-1]}, 1, 80) FROM {table} m WHERE "
+           + " AND ".join(where) + " ORDER BY m.id DESC LIMIT ?")
+    return conn.execute(sql, [*params, limit]).fetchall()
+
+# =========================
+# ---- 일정 ---------------
+# =========================
+def add_schedule(conn: sqlite3.Connection, day: str, content: str):
+    with conn:
+        conn.execute("INSERT INTO schedules(date, content) VALUES(?, ?)", (day, content))
+
+def month_schedules(conn: sqlite3.Connection, year: int, month: int) -> list[tuple[str, int, str]]:
+    # 보이는 달만 (date 인덱스 범위 조회). (date, id, content) 날짜순
+    first = date(year, month, 1)
+    nxt = date(year + month // 12, month % 12 + 1, 1)
+    return conn.execute(
+        "SELECT date, id, content FROM schedules WHERE date >= ? AND date < ? ORDER BY date, id",
+        (first.isoformat(), nxt.isoformat()),
+    ).fetchall()
+
+def delete_schedule(conn: sqlite3.Connection, schedule_id: int):
+    with conn:
+        conn.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
+
+# =========================
+# ---- 스트릭/레벨 --------
+# =========================
+STREAK_LEVELS = [(30, 5), (21, 4), (14, 3), (7, 2)]  # (연속 일수 이상, 레벨)
+
+def streaks(conn: sqlite3.Connection, today: str | None = None) -> tuple[int, int]:
+    # (현재 스트릭, 최장 스트릭). 오늘이나 어제로 끝나는 구간만 '현재'로 친다
+    today = today or date.today().isoformat()
+    row = conn.execute(
+        "SELECT len FROM study_runs WHERE end >= date(?, '-1 day') AND end <= ? ORDER BY end DESC LIMIT 1",
+        (today, today),
+    ).fetchone()
+    longest = conn.execute("SELECT MAX(len) FROM study_runs").fetchone()[0]
+    return (row[0] if row else 0), (longest or 0)
+
+def current_streak(days: set[date], today: date | None = None) -> int:
+    # DB 없이 날짜 집합만 있을 때 (studyapp.py). streaks() 와 같은 정의:
+    # 오늘이나 어제로 끝나는 구간만 '현재' 스트릭. 첫 빈 날에서 멈추므로 기록 전체를 훑지 않는다
+    today = today or date.today()
+    day = today if today in days else today - timedelta(days=1)
+    streak = 0
+    while day in days:
+        streak += 1
+        day -= timedelta(days=1)
+    return streak
+
+def streak_level(streak: int) -> int:
+    return next((level for days, level in STREAK_LEVELS if streak >= days), 1)
+
+def rebuild_runs(conn: sqlite3.Connection):
+    # 구간 테이블을 studytime 에서 다시 계산 (트리거를 거치지 않고 직접 쓴 경우 등)
+    with conn:
+        conn.execute("DELETE FROM study_runs")
+        conn.execute(f"INSERT INTO study_runs(start, end, len) {RUNS_SQL}")
@@ -0,0 +1,233 @@
+# study_store.py
+# studyapp.py 저장소 (할 일/메모/일정/독서/공부 시간)
+# 예전에는 st.session_state 리스트라 새로고침하면 다 사라졌다.
+# 컬렉션 이름별로 따로 읽고 쓰는 저장소 3가지:
+#   - MemoryBackend    : 예전처럼 휘발성 (세션마다 하나)
+#   - JsonLinesBackend : 컬렉션마다 <폴더>/<이름>.jsonl 에 변경을 덧붙임
+#   - SqliteBackend    : 파일 하나, items 테이블 (컬렉션 + id)
+# 모든 항목은 "id" 를 가진 dict. items(name) 은 그 컬렉션만 읽는다
+# → ToDo 페이지를 열 때 메모/독서는 읽지도, 역직렬화하지도 않음.
+import abc
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+
+from storage import atomic_write_text, file_lock
+
+COLLECTIONS = ("todos", "memos", "calendar", "books", "study")
+
+def new_id() -> str:
+    return uuid.uuid4().hex
+
+class Backend(abc.ABC):
+    # 공통 인터페이스. items() 의 dict 는 추가된 순서 (id → 항목)
+    @abc.abstractmethod
+    def items(self, name: str) -> dict[str, dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get(self, name: str, item_id: str) -> dict | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def put(self, name: str, item: dict) -> dict:
+        # 추가 또는 같은 id 교체. id 가 없으면 새로 매김
+        raise NotImplementedError
+
+    def put_many(self, name: str, items: list[dict]) -> list[dict]:
+        return [self.put(name, item) for item in items]
+
+    @abc.abstractmethod
+    def delete(self, name: str, item_id: str):
+        raise NotImplementedError
+
+    def delete_many(self, name: str, item_ids: list[str]):
+        for item_id in item_ids:
+            self.delete(name, item_id)
+
+    def add(self, name: str, **fields) -> dict:
+        return self.put(name, {"id": new_id(), **fields})
+
+# =========================
+# ---- 메모리 ------------
+# =========================
+class MemoryBackend(Backend):
+    def __init__(self):
+        self._data = {}
+
+    def items(self, name: str) -> dict[str, dict]:
+        return dict(self._data.get(name, {}))
+
+    def get(self, name: str, item_id: str) -> dict | None:
+        return self._data.get(name, {}).get(item_id)
+
+    def put(self, name: str, item: dict) -> dict:
+        item = {**item, "id": item.get("id") or new_id()}
+        self._data.setdefault(name, {})[item["id"]] = item
+        return item
+
+    def delete(self, name: str, item_id: str):
+        self._data.get(name, {}).pop(item_id, None)
+
+# =========================
+# ---- JSON lines --------
+# =========================
+class JsonLinesBackend(Backend):
+    # 줄마다 {"put": 항목} 또는 {"del": id}. 같은 id 는 마지막 줄이 이긴다
+    # 읽은 위치(offset)를 기억해 두고 다음엔 새로 붙은 줄만 읽음 (다른 세션/프로세스가 쓴 것 포함)
+    # 지워지거나 덮인 줄이 살아있는 항목보다 많아지면 파일을 다시 씀 (compaction)
+    COMPACT_MIN_LINES = 256
+
+    def __init__(self, folder: Path | str):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._cache = {}  # name -> {"items": dict, "offset": int, "inode": int, "lines": int}
+
+    def _path(self, name: str) -> Path:
+        if name not in COLLECTIONS:
+            raise KeyError(name)
+        return self.folder / f"{name}.jsonl"
+
+    def _sync(self, name: str) -> dict:
+        # 캐시를 파일 끝까지 따라잡기. 파일이 새로 쓰였으면(compaction) 처음부터
+        path = self._path(name)
+        state = self._cache.get(name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            state = self._cache[name] = {"items": {}, "offset": 0, "inode": None, "lines": 0}
+            return state
+        if state is None or state["inode"] != st.st_ino or st.st_size < state["offset"]:
+            state = self._cache[name] = {"items": {}, "offset": 0, "inode": st.st_ino, "lines": 0}
+        if st.st_size > state["offset"]:
+            with path.open("rb") as f:
+                f.seek(state["offset"])
+                chunk = f.read(st.st_size - state["offset"])
+            end = chunk.rfind(b"\n") + 1  # 끝의 반쪽 줄은 다음에
+            for line in chunk[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    continue
+                if "put" in op:
+                    state["items"][op["put"]["id"]] = op["put"]
+                elif "del" in op:
+                    state["items"].pop(op["del"], None)
+                state["lines"] += 1
+            state["offset"] += end
+        return state
+
+    def items(self, name: str) -> dict[str, dict]:
+        with self._lock:
+            return dict(self._sync(name)["items"])
+
+    def get(self, name: str, item_id: str) -> dict | None:
+        with self._lock:
+            return self._sync(name)["items"].get(item_id)
+
+    def _write(self, name: str, ops: list[dict]):
+        path = self._path(name)
+        with self._lock, file_lock(path.with_suffix(".lock")):
+            state = self._sync(name)
+            with path.open("ab") as f:
+                f.write(b"".join((json.dumps(op, ensure_ascii=False) + "\n").encode("utf-8") for op in ops))
+            self._sync(name)
+            if state["lines"] > max(self.COMPACT_MIN_LINES, 2 * len(state["items"])):
+                text = "".join(json.dumps({"put": item}, ensure_ascii=False) + "\n"
+                               for item in state["items"].values())
+                atomic_write_text(path, text)
+                self._cache.pop(name, None)
+
+    def put(self, name: str, item: dict) -> dict:
+        item = {**item, "id": item.get("id") or new_id()}
+        self._write(name, [{"put": item}])
+        return item
+
+    def put_many(self, name: str, items: list[dict]) -> list[dict]:
+        items = [{**item, "id": item.get("id") or new_id()} for item in items]
+        if items:
+            self._write(name, [{"put": item} for item in items])
+        return items
+
+    def delete(self, name: str, item_id: str):
+        self._write(name, [{"del": item_id}])
+
+    def delete_many(self, name: str, item_ids: list[str]):
+        if item_ids:
+            self._write(name, [{"del": item_id} for item_id in item_ids])
+
+# =========================
+# ---- SQLite ------------
+# =========================
+# seq 로 추가 순서 유지, (collection, id) 로 교체/삭제
+STORE_MIGRATIONS = [
+    (
+        """CREATE TABLE items(
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        collection TEXT NOT NULL,
+        id TEXT NOT NULL,
+        data TEXT NOT NULL,
+        UNIQUE(collection, id)
+        )""",
+        "CREATE INDEX items_collection_seq ON items(collection, seq)",
+    ),
+]
+
+class SqliteBackend(Backend):
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+
+    def _conn(self):
+        # 풀에서 빌린 연결 (with 블록이 끝나면 돌려줌)
+        import study_db
+        return study_db.connection(self.path, STORE_MIGRATIONS)
+
+    def items(self, name: str) -> dict[str, dict]:
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT data FROM items WHERE collection = ? ORDER BY seq", (name,)).fetchall()
+        return {item["id"]: item for item in map(json.loads, (r[0] for r in rows))}
+
+    def get(self, name: str, item_id: str) -> dict | None:
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT data FROM items WHERE collection = ? AND id = ?", (name, item_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_many(self, name: str, items: list[dict]) -> list[dict]:
+        # 교체해도 순서(seq)는 그대로
+        items = [{**item, "id": item.get("id") or new_id()} for item in items]
+        with self._conn() as conn, conn:
+            conn.executemany(
+                "INSERT INTO items(collection, id, data) VALUES(?, ?, ?) "
+                "ON CONFLICT(collection, id) DO UPDATE SET data = excluded.data",
+                [(name, item["id"], json.dumps(item, ensure_ascii=False)) for item in items],
+            )
+        return items
+
+    def put(self, name: str, item: dict) -> dict:
+        return self.put_many(name, [item])[0]
+
+    def delete_many(self, name: str, item_ids: list[str]):
+        with self._conn() as conn, conn:
+            conn.executemany("DELETE FROM items WHERE collection = ? AND id = ?",
+                             [(name, item_id) for item_id in item_ids])
+
+    def delete(self, name: str, item_id: str):
+        self.delete_many(name, [item_id])
+
+def open_backend(spec: str) -> Backend:
+    # "memory" / "jsonl:<폴더>" / "sqlite:<파일>"
+    kind, _, target = spec.partition(":")
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "jsonl":
+        return JsonLinesBackend(target or "studyapp_data")
+    if kind == "sqlite":
+        return SqliteBackend(target or "studyapp.db")
+    raise ValueError(f"알 수 없는 저장소: {spec!r} (memory / jsonl:<폴더> / sqlite:<파일>)")
@@ -3,6 +3,10 @@ import pandas as pd
 import plotly.express as px
 import datetime
 import random
+import os
+
+import study_db
+from study_store import MemoryBackend, open_backend
 
 st.set_page_config(page_title="Study Manager", layout="wide")
 
@@ -47,23 +51,26 @@ bad_messages = [
 ]
 
 # -----------------------------
-# 세션 상태
+# 저장소
 # -----------------------------
 
-if "todos" not in st.session_state:
-    st.session_state.todos = []
-
-if "memos" not in st.session_state:
-    st.session_state.memos = []
+# STUDYAPP_STORE = memory | jsonl:<폴더> | sqlite:<파일>
+# 페이지마다 자기 컬렉션만 읽는다 (store.items("todos") 등)
+STORE_SPEC = os.environ.get("STUDYAPP_STORE", "jsonl:studyapp_data")
 
-if "calendar" not in st.session_state:
-    st.session_state.calendar = []
+@st.cache_resource
+def shared_store(spec):
+    return open_backend(spec)
 
-if "books" not in st.session_state:
-    st.session_state.books = []
+def get_store():
+    # memory 는 예전처럼 세션마다 따로, 파일 저장소는 프로세스에서 하나를 같이 씀
+    if STORE_SPEC == "memory":
+        if "store" not in st.session_state:
+            st.session_state.store = MemoryBackend()
+        return st.session_state.store
+    return shared_store(STORE_SPEC)
 
-if "study" not in st.session_state:
-    st.session_state.study = []
+store = get_store()
 
 if "page" not in st.session_state:
     st.session_state.page = "홈"
@@ -124,16 +131,38 @@ elif st.session_state.page == "ToDo":
     task = st.text_input("할 일 입력")
 
     if st.button("추가"):
-        st.session_state.todos.append({
-            "task":task,
-            "done":False
-        })
+        store.add("todos", task=task, done=False)
+
+    todos = store.items("todos")
+
+    # 체크한 항목 하나만 저장 (키는 목록 위치가 아니라 id → 추가/삭제해도 안 섞임)
+    def toggle_todo(todo_id):
+        todo = store.get("todos", todo_id)
+        if todo is not None:
+            store.put("todos", {**todo, "done": st.session_state[f"todo_{todo_id}"]})
+
+    # 일괄 처리: 바뀌는 항목만 모아서 한 번에 쓰기
+    def complete_all():
+        changed = [{**t, "done": True} for t in store.items("todos").values() if not t["done"]]
+        store.put_many("todos", changed)
+
+    def delete_done():
+        done_ids = [t["id"] for t in store.items("todos").values() if t["done"]]
+        store.delete_many("todos", done_ids)
 
-    for i,todo in enumerate(st.session_state.todos):
+    for todo_id,todo in todos.items():
 
-        done = st.checkbox(todo["task"],value=todo["done"],key=i)
+        # 체크 상태는 저장소 값 기준 (일괄 처리/다른 탭에서 바뀐 것도 그대로 반영)
+        st.session_state[f"todo_{todo_id}"] = todo["done"]
 
-        st.session_state.todos[i]["done"] = done
+        st.checkbox(todo["task"],key=f"todo_{todo_id}",on_change=toggle_todo,args=(todo_id,))
+
+    if todos:
+
+        col1,col2 = st.columns(2)
+
+        col1.button("✅ 모두 완료",on_click=complete_all)
+        col2.button("🗑 완료한 항목 삭제",on_click=delete_done)
 
     if st.button("홈으로"):
         st.session_state.page="홈"
@@ -151,13 +180,9 @@ elif st.session_state.page == "메모":
 
     if st.button("저장"):
 
-        st.session_state.memos.append({
-            "title":title,
-            "content":content,
-            "date":str(datetime.date.today())
-        })
+        store.add("memos", title=title, content=content, date=str(datetime.date.today()))
 
-    for memo in st.session_state.memos[::-1]:
+    for memo in reversed(store.items("memos").values()):
 
         col1,col2 = st.columns([4,1])
 
@@ -185,12 +210,9 @@ elif st.session_state.page == "일정":
 
     if st.button("일정 추가"):
 
-        st.session_state.calendar.append({
-            "date":date,
-            "schedule":schedule
-        })
+        store.add("calendar", date=str(date), schedule=schedule)
 
-    df = pd.DataFrame(st.session_state.calendar)
+    df = pd.DataFrame(list(store.items("calendar").values()), columns=["date","schedule"])
 
     if not df.empty:
 
@@ -218,14 +240,9 @@ elif st.session_state.page == "생기부 독서":
 
     if st.button("기록"):
 
-        st.session_state.books.append({
-            "title":book,
-            "subject":subject,
-            "thought":thought,
-            "date":str(datetime.date.today())
-        })
+        store.add("books", title=book, subject=subject, thought=thought, date=str(datetime.date.today()))
 
-    for b in st.session_state.books[::-1]:
+    for b in reversed(store.items("books").values()):
 
         col1,col2 = st.columns([4,1])
 
@@ -254,12 +271,9 @@ elif st.session_state.page == "공부 통계":
 
     if st.button("기록"):
 
-        st.session_state.study.append({
-            "date":day,
-            "hours":hours
-        })
+        store.add("study", date=str(day), hours=hours)
 
-    df = pd.DataFrame(st.session_state.study)
+    df = pd.DataFrame(list(store.items("study").values()), columns=["date","hours"])
 
     if not df.empty:
 
@@ -272,16 +286,8 @@ elif st.session_state.page == "공부 통계":
 
         st.plotly_chart(fig)
 
-        dates = sorted(df["date"])
-
-        streak = 1
-
-        for i in range(len(dates)-1,0,-1):
-
-            if (dates[i] - dates[i-1]).days == 1:
-                streak += 1
-            else:
-                break
+        # dsghstudy 와 같은 정의: 오늘이나 어제로 끝나는 연속 구간만 (같은 날 여러 번 기록해도 하루)
+        streak = study_db.current_streak(set(pd.to_datetime(df["date"]).dt.date))
 
         st.subheader("🔥 연속 공부")
 
@@ -295,16 +301,7 @@ elif st.session_state.page == "공부 통계":
             st.snow()
             st.success("🏆 30일 연속 공부!")
 
-        if streak >= 30:
-            level = 5
-        elif streak >= 21:
-            level = 4
-        elif streak >= 14:
-            level = 3
-        elif streak >= 7:
-            level = 2
-        else:
-            level = 1
+        level = study_db.streak_level(streak)
 
         st.subheader("⭐ 캐릭터 레벨")
 
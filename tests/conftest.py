@@ -0,0 +1,5 @@
+# 저장소 루트의 모듈(xp_engine, storage ...)을 tests/ 에서 바로 import
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,108 @@
+# advice.py 라우팅: 라벨 붙은 평가 세트(advice_eval.jsonl)를 규칙 파일 그대로 돌려서
+# 규칙/정규화를 고치다 정확도가 떨어지면 여기서 걸리게
+import json
+from pathlib import Path
+
+import pytest
+
+import advice
+
+ROOT = Path(__file__).resolve().parent.parent
+EVAL_PATH = ROOT / "advice_eval.jsonl"
+MIN_ACCURACY = 1.0  # 지금 규칙은 45문항 전부 맞힘. 일부러 낮출 때만 같이 고치기
+
+@pytest.fixture(scope="module")
+def book() -> advice.RuleBook:
+    return advice.RuleBook.from_dict(json.loads(advice.RULES_PATH.read_text(encoding="utf-8")))
+
+@pytest.fixture(scope="module")
+def eval_set() -> list[dict]:
+    return [json.loads(line) for line in EVAL_PATH.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+def test_eval_set_accuracy(book, eval_set):
+    wrong = [(r["text"], r["label"], book.route(r["text"])) for r in eval_set
+             if (book.route(r["text"]) or "unknown") != r["label"]]
+    accuracy = 1 - len(wrong) / len(eval_set)
+    assert accuracy >= MIN_ACCURACY, f"정확도 {accuracy:.1%}, 틀린 것 (글, 라벨, 결과): {wrong}"
+
+def test_eval_set_covers_every_category(book, eval_set):
+    assert {r["label"] for r in eval_set} >= set(book.rules)
+
+# =========================
+# ---- 매칭 규칙 ----------
+# =========================
+def make_book(*rules) -> advice.RuleBook:
+    return advice.RuleBook.from_dict({"rules": [
+        {"category": c, "priority": p, "keywords": k, "responses": [c]} for c, p, k in rules]})
+
+def test_matcher_finds_overlapping_keywords():
+    matcher = advice.KeywordMatcher({"he": [1], "she": [2], "hers": [3]})
+    assert sorted(v for _w, v in matcher.find("ushers")) == [1, 2, 3]
+
+def test_single_letter_keywords_match_whole_tokens_only(book):
+    assert book.route("비가 와서 우울해") == "weather"
+    assert book.route("비밀 이야기") is None
+    assert book.route("점심 뭐 먹지") is None
+
+def test_prefix_keyword_and_normalization(book):
+    assert book.route("오늘 늦잠 잤어") == "late"
+    assert book.route("ＳＨＯＰＰＩＮＧ 말고 불닭!!") == "food"  # 전각 문자/문장부호
+    assert book.route("좋아하는사람 생겼어") == "love"        # 띄어쓰기 없이 써도
+
+def test_longer_keywords_then_priority_win():
+    book = make_book(("a", 10, ["시험"]), ("b", 5, ["시험 공부"]), ("c", 20, ["공부"]))
+    assert book.route("시험 공부 하기 싫다") == "b"   # 더 구체적인 키워드
+    book = make_book(("low", 1, ["숙제"]), ("high", 9, ["과제"]))
+    assert book.route("숙제랑 과제") == "high"        # 점수가 같으면 priority
+
+@pytest.mark.parametrize("keyword", ["!!", "  ", "*", "?!*"])
+def test_keywords_without_letters_are_rejected(keyword):
+    with pytest.raises(ValueError):
+        make_book(("x", 0, [keyword]))
+    with pytest.raises(ValueError):
+        advice.RuleBook.from_dict({"rules": [{"category": "x", "keywords": ["가나"], "responses": ["r"],
+                                              "branches": [{"keywords": [keyword], "responses": ["b"]}]}]})
+
+def test_daily_answer_is_fixed_per_user_and_day(book):
+    first = book.reply("오늘 운세 알려줘", "민지", "2026-10-17")
+    assert all(book.reply("운세", "민지", "2026-10-17") == first for _ in range(5))
+    days = {book.reply("운세", "민지", f"2026-10-{d:02d}") for d in range(1, 29)}
+    assert len(days) > 1
+
+def test_broken_rules_file_keeps_previous_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"rules": [{"category": "a", "keywords": ["사과"], "responses": ["r"]}]}),
+                    encoding="utf-8")
+    assert advice.current_rules(path).route("사과 먹자") == "a"
+    path.write_text(json.dumps({"rules": [{"category": "a", "keywords": ["!!"], "responses": ["r"]},
+                                          {"category": "b", "keywords": ["배"], "responses": ["r"]}]}),
+                    encoding="utf-8")
+    with pytest.warns(UserWarning):
+        assert advice.current_rules(path).route("사과 먹자") == "a"
+
+# =========================
+# ---- advice_batch -------
+# =========================
+def test_batch_skips_bad_records_and_reports_them(tmp_path, capsys):
+    import io
+
+    import advice_batch
+
+    src = tmp_path / "q.jsonl"
+    src.write_text("\n".join([
+        '{"id": 1, "text": "불닭 먹고 싶어", "label": "food"}',
+        '{"id": 2, "text": 5}',
+        '{"id": 3, "text": ["운세"]}',
+        '{"id": 4, "text": "운세", "date": 20261017}',
+        '{"id": 5, "text": "운세", "date": "어제"}',
+        'not json',
+        '{"id": 6, "text": "운세", "user": 7, "date": "2026-10-17"}',
+    ]) + "\n", encoding="utf-8")
+    dst = io.StringIO()
+    stats = advice_batch.run(src, dst)
+    out = [json.loads(line) for line in dst.getvalue().splitlines()]
+    assert [r["id"] for r in out] == [1, 2, 6]
+    assert out[1]["text"] == "5" and out[2]["category"] == "fortune"
+    assert stats["questions"] == 3 and stats["accuracy"] == 1.0
+    err = capsys.readouterr().err
+    assert all(f"q.jsonl:{n}:" in err for n in (3, 4, 5, 6))
@@ -0,0 +1,78 @@
+# bulk_io: CSV/Parquet 으로 내보내고 다시 가져오기 (SQLite 테이블, app.py 로그)
+import json
+
+import pandas as pd
+import pytest
+
+import bulk_io
+import storage
+import study_db
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "study.db"
+    yield path
+    study_db.close(path)
+
+def test_studytime_csv_import_sums_same_day(db, tmp_path):
+    src = tmp_path / "hours.csv"
+    src.write_text("date,hours\n2024-03-01,2\n2024-03-02,\n2024-03-01,3\n", encoding="utf-8")
+    assert bulk_io.import_sqlite(db, "studytime", src, chunksize=2) == 3
+    with study_db.connection(db) as conn:
+        assert study_db.study_hours(conn) == [("2024-03-01", 5), ("2024-03-02", 0)]
+        assert study_db.streaks(conn, "2024-03-02") == (2, 2)
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_sqlite_round_trip(db, tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    rows = [(f"책 {i}", "국어", f"생각 {i}") for i in range(7)]
+    with study_db.connection(db) as conn, conn:
+        conn.executemany("INSERT INTO books(title, subject, thought) VALUES(?, ?, ?)", rows)
+    dst = tmp_path / f"books{suffix}"
+    assert bulk_io.export_sqlite(db, "books", dst, chunksize=3) == 7
+    other = tmp_path / "other.db"
+    try:
+        assert bulk_io.import_sqlite(other, "books", dst, chunksize=3) == 7
+        with study_db.connection(other) as conn:
+            assert conn.execute("SELECT title, subject, thought FROM books ORDER BY id").fetchall() == rows
+    finally:
+        study_db.close(other)
+
+def test_parquet_export_with_all_null_chunk(db, tmp_path):
+    # 첫 청크에서 컬럼이 전부 NULL 이어도 스키마가 바뀌지 않아서 끝까지 써짐
+    pytest.importorskip("pyarrow")
+    with study_db.connection(db) as conn, conn:
+        conn.executemany("INSERT INTO todos(task, done) VALUES(?, ?)", [(None, None)] * 3 + [("b", 1)] * 3)
+    dst = tmp_path / "todos.parquet"
+    assert bulk_io.export_sqlite(db, "todos", dst, chunksize=3) == 6
+    out = pd.read_parquet(dst)
+    assert out["task"].isna().sum() == 3 and list(out["task"].dropna()) == ["b"] * 3
+    assert list(out["done"].dropna()) == [1] * 3
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_json_logs_round_trip(tmp_path, monkeypatch, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(storage, "FSYNC", False)
+    logs = [{"date": f"2024-03-0{i}", "study_minutes": 10 * i,
+             "habits_completed": [] if i < 4 else ["운동", "독서"], "notes": f"메모 {i}"} for i in range(1, 8)]
+    src_json = tmp_path / "user_data.json"
+    src_json.write_text(json.dumps({"logs": logs}, ensure_ascii=False), encoding="utf-8")
+    dst = tmp_path / f"logs{suffix}"
+    assert bulk_io.export_json(src_json, dst, chunksize=3) == 7
+    new_json = tmp_path / "new.json"
+    assert bulk_io.import_json(new_json, dst, chunksize=3) == 7
+    assert storage.JournalStore(new_json).load(lambda: {"logs": []})["logs"].to_list() == logs
+
+def test_bad_date_leaves_json_untouched(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "FSYNC", False)
+    target = tmp_path / "user_data.json"
+    target.write_text(json.dumps({"logs": [{"date": "2024-03-01", "study_minutes": 5,
+                                            "habits_completed": [], "notes": ""}]}), encoding="utf-8")
+    before = target.read_text(encoding="utf-8")
+    src = tmp_path / "bad.csv"
+    src.write_text("date,study_minutes,habits_completed,notes\n2024-03-02,10,[],\n어제,10,[],\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        bulk_io.import_json(target, src)
+    assert target.read_text(encoding="utf-8") == before
@@ -0,0 +1,41 @@
+# chart_data.downsample: 기간이 아무리 길어도 점 개수는 max_points 이하, 마지막 값은 그대로
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from chart_data import MAX_POINTS, downsample
+
+def cumulative(days: int, start: date = date(1900, 1, 1)) -> pd.DataFrame:
+    return pd.DataFrame({"date": [start + timedelta(days=i) for i in range(days)],
+                         "xp_cum": [float(i) for i in range(days)]})
+
+def test_short_history_is_unchanged():
+    df = cumulative(100)
+    out, unit = downsample(df, {"xp_cum": "last"})
+    assert unit == "일"
+    assert out.equals(df)
+
+@pytest.mark.parametrize("days, max_points", [
+    (1300, MAX_POINTS), (5500, MAX_POINTS), (66_000, MAX_POINTS), (400_000, MAX_POINTS),
+    (3000, 10), (40_000, 5), (365 * 30, 3),
+])
+def test_point_count_is_bounded(days, max_points):
+    out, unit = downsample(cumulative(days), {"xp_cum": "last"}, max_points=max_points)
+    assert 0 < len(out) <= max_points
+    assert out["xp_cum"].iloc[-1] == days - 1
+    assert unit != "일"
+
+@pytest.mark.parametrize("offset", range(7))
+def test_bucket_edges_do_not_overshoot(offset):
+    # 주 단위 어림값이 딱 max_points 근처일 때 (시작 요일에 따라 구간이 하나 더 생김)
+    for days in range(1250, 1262):
+        df = pd.DataFrame({"date": [date(2020, 1, 1) + timedelta(days=offset + i) for i in range(days)],
+                           "minutes": [1] * days})
+        out, _ = downsample(df, {"minutes": "sum"})
+        assert len(out) <= MAX_POINTS
+        assert out["minutes"].sum() == days
+
+def test_empty_frame():
+    out, unit = downsample(cumulative(0), {"xp_cum": "last"})
+    assert out.empty and unit == "일"
@@ -0,0 +1,44 @@
+# RollingWindows 7/30/90일 합계가 매번 창 안의 로그를 다시 더한 값과 같은지
+# (무작위 추가/덮어쓰기/삭제 + 하루 넘김, 여러 날 건너뛰기, 날짜가 뒤로 가는 경우)
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from logstore import LogStore
+from rolling import RollingWindows
+
+BASE = date(2024, 1, 1)
+
+def assert_windows_match(rw: RollingWindows, logs: LogStore, today: date):
+    for w in (7, 30, 90):
+        rows = [r for r in logs if today - timedelta(days=w - 1) <= date.fromisoformat(r["date"]) <= today]
+        assert rw.total(w, "study_minutes", today) == sum(r["study_minutes"] for r in rows)
+        assert rw.total(w, "habits_count", today) == sum(len(r["habits_completed"]) for r in rows)
+        assert rw.count(w, today) == len(rows)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_edits_and_rollover(seed):
+    rng = random.Random(seed)
+    today = BASE + timedelta(days=50)
+    logs = LogStore()
+    rw = RollingWindows(logs, today=today)
+    for _ in range(2000):
+        dstr = (BASE + timedelta(days=rng.randint(0, 200))).isoformat()
+        if rng.random() < 0.25:
+            logs.delete(dstr)
+        else:
+            logs.upsert({"date": dstr, "study_minutes": rng.randint(0, 100),
+                         "habits_completed": ["운동"] * rng.randint(0, 3)})
+        if rng.random() < 0.05:
+            today += timedelta(days=rng.choice([1, 1, 2, 5, 100, -30]))
+        assert_windows_match(rw, logs, today)
+
+def test_existing_logs_and_mean():
+    logs = LogStore([{"date": (BASE + timedelta(days=i)).isoformat(), "study_minutes": 10 * i,
+                      "habits_completed": []} for i in range(10)])
+    today = BASE + timedelta(days=9)
+    rw = RollingWindows(logs, today=today)
+    assert_windows_match(rw, logs, today)
+    assert rw.total(7, "study_minutes", today) == sum(10 * i for i in range(3, 10))
+    assert rw.mean(7, "study_minutes", today) == pytest.approx(sum(10 * i for i in range(3, 10)) / 7)
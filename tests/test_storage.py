@@ -0,0 +1,111 @@
+# storage.JournalStore: 여러 세션(탭)이 같은 파일에 번갈아 쓸 때 merge 결과가
+# 잠금 순서대로 모든 op 를 한 번에 replay 한 것과 같은지 (중간 compaction 포함)
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import storage
+from logstore import LogStore
+from xp_engine import XPEngine
+
+TODAY = date(2024, 3, 1)
+HABITS = [{"name": "운동", "xp": 10}]
+
+def default_data() -> dict:
+    return {"user": {"name": ""}, "logs": [], "timer_defs": []}
+
+def plain(data: dict) -> dict:
+    # 다른 세션의 op 가 먼저 얹히면 timer_defs 안 순서는 달라질 수 있어서 id 순으로 비교
+    out = {k: (v.to_list() if isinstance(v, LogStore) else v) for k, v in data.items()}
+    out["timer_defs"] = sorted(out["timer_defs"], key=lambda t: t["id"])
+    return out
+
+def random_ops(rng: random.Random) -> list[dict]:
+    ops = []
+    for _ in range(rng.randint(1, 3)):
+        dstr = (TODAY - timedelta(days=rng.randint(0, 15))).isoformat()
+        tid = f"t{rng.randint(0, 4)}"
+        kind = rng.random()
+        if kind < 0.4:
+            ops.append(storage.op_upsert_log({"date": dstr, "study_minutes": rng.choice([0, 10, 30]),
+                                              "habits_completed": rng.choice([[], ["운동"]])}))
+        elif kind < 0.55:
+            ops.append(storage.op_delete_log(dstr))
+        elif kind < 0.8:
+            ops.append(storage.op_upsert_item("timer_defs", {"id": tid, "n": rng.randint(0, 99)}))
+        elif kind < 0.9:
+            ops.append(storage.op_delete_item("timer_defs", tid))
+        else:
+            ops.append(storage.op_set("user", {"name": rng.choice(["민지", "서연"])}))
+    return ops
+
+@pytest.fixture(autouse=True)
+def no_fsync(monkeypatch):
+    monkeypatch.setattr(storage, "FSYNC", False)
+
+@pytest.mark.parametrize("compact_bytes", [256 * 1024, 2048])
+def test_merge_matches_replay_of_all_writes(tmp_path, monkeypatch, compact_bytes):
+    # 세 세션이 번갈아 쓰고 가끔 새로고침. 작은 compact_bytes 는 중간 compaction 도 거치게
+    monkeypatch.setattr(storage, "COMPACT_BYTES", compact_bytes)
+    rng = random.Random(11)
+    path = tmp_path / "user_data.json"
+    sessions = []
+    for _ in range(3):
+        store = storage.JournalStore(path)
+        sessions.append((store, store.load(default_data)))
+    expected = storage.replay(default_data(), [])
+    for _ in range(600):
+        store, data = rng.choice(sessions)
+        if rng.random() < 0.2:
+            store.refresh(data)
+            continue
+        ops = random_ops(rng)
+        if rng.random() < 0.5:
+            store.append(storage.replay(data, ops), ops)
+        else:
+            store.update(data, lambda d: storage.replay(d, ops) and ops)
+        storage.replay(expected, ops)  # 잠금 순서대로 쓰였으니 그 순서로 다시 적용한 결과와 같아야 함
+        assert plain(data) == plain(expected)
+    for store, data in sessions:
+        store.refresh(data)
+        assert plain(data) == plain(expected)
+    assert plain(storage.JournalStore(path).load(default_data)) == plain(expected)
+
+def test_update_adds_on_top_of_other_sessions(tmp_path):
+    # 두 탭이 같은 날에 30분, 45분을 더하면 75분 (읽고-고치고-쓰기를 잠금 안에서)
+    path = tmp_path / "user_data.json"
+    a, b = storage.JournalStore(path), storage.JournalStore(path)
+    data_a, data_b = a.load(default_data), b.load(default_data)
+    day = TODAY.isoformat()
+
+    def add(minutes):
+        def fn(data):
+            row = data["logs"].get(day) or {"date": day, "study_minutes": 0, "habits_completed": []}
+            row = {**row, "study_minutes": row["study_minutes"] + minutes}
+            data["logs"].upsert(row)
+            return [storage.op_upsert_log(row)]
+        return fn
+
+    a.update(data_a, add(30))
+    b.update(data_b, add(45))
+    assert data_b["logs"].get(day)["study_minutes"] == 75
+    a.refresh(data_a)
+    assert data_a["logs"].get(day)["study_minutes"] == 75
+
+def test_engine_follows_merged_logs(tmp_path):
+    # 다른 탭의 변경이 merge 로 들어와도 LogStore 구독자(XPEngine) 가 새로 계산한 엔진과 같은 값
+    rng = random.Random(5)
+    path = tmp_path / "user_data.json"
+    a, b = storage.JournalStore(path), storage.JournalStore(path)
+    data_a, data_b = a.load(default_data), b.load(default_data)
+    engine = XPEngine(data_a["logs"], HABITS, 0.2)
+    for _ in range(400):
+        ops = [op for op in random_ops(rng) if op["op"] in ("upsert_log", "delete_log")]
+        store, data = (a, data_a) if rng.random() < 0.5 else (b, data_b)
+        store.update(data, lambda d: storage.replay(d, ops) and ops)
+        a.refresh(data_a)
+        fresh = XPEngine(LogStore(data_a["logs"].to_list()), HABITS, 0.2)
+        assert engine.total_xp == pytest.approx(fresh.total_xp)
+        assert engine.current_streak(TODAY) == fresh.current_streak(TODAY)
+        assert engine.xp_cum() == pytest.approx(fresh.xp_cum())
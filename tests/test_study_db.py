@@ -0,0 +1,116 @@
+# study_db: 마이그레이션, 트리거가 유지하는 study_runs, 스트릭, 연결 풀
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+import study_db
+
+TODAY = date(2024, 3, 1)
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "study.db"
+    yield path
+    study_db.close(path)
+
+def runs_from_dates(days: set[date]) -> set[tuple[str, str, int]]:
+    # 날짜 집합을 처음부터 훑어서 (시작, 끝, 길이) 구간들
+    runs, start, prev = set(), None, None
+    for d in sorted(days):
+        if prev is None or d != prev + timedelta(days=1):
+            if start is not None:
+                runs.add((start.isoformat(), prev.isoformat(), (prev - start).days + 1))
+            start = d
+        prev = d
+    if start is not None:
+        runs.add((start.isoformat(), prev.isoformat(), (prev - start).days + 1))
+    return runs
+
+def stored_runs(conn) -> set[tuple[str, str, int]]:
+    return set(conn.execute("SELECT start, end, len FROM study_runs"))
+
+def stored_days(conn) -> set[date]:
+    return {date.fromisoformat(d) for (d,) in conn.execute("SELECT date FROM studytime")}
+
+# =========================
+# ---- 마이그레이션 -------
+# =========================
+def test_fresh_db_reaches_latest_version(db):
+    with study_db.connection(db) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(study_db.MIGRATIONS)
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"todos", "memos", "books", "studytime", "study_runs", "schedules"} <= tables
+    # 두 번째 migrate 는 아무것도 안 함
+    conn = sqlite3.connect(db)
+    assert study_db.migrate(conn) == len(study_db.MIGRATIONS)
+    conn.close()
+
+def test_old_file_is_migrated(db):
+    # 예전 앱이 만든 파일: 같은 날 여러 행, 날짜가 아닌 값, memos 에 섞인 일정
+    conn = sqlite3.connect(db)
+    for stmt in study_db.MIGRATIONS[0]:
+        conn.execute(stmt)
+    conn.executemany("INSERT INTO studytime(date, hours) VALUES(?, ?)",
+                     [("2024-02-28", 2), ("2024-02-28", 3), ("2024-02-29", None), ("2024-03-01", 1), ("모름", 4)])
+    conn.executemany("INSERT INTO memos(title, content, date) VALUES(?, ?, ?)",
+                     [("일정", "시험", "2024-03-05"), ("메모", "그냥", "2024-03-01")])
+    conn.commit()
+    conn.close()
+    with study_db.connection(db) as conn:
+        assert study_db.study_hours(conn) == [("2024-02-28", 5), ("2024-02-29", 0), ("2024-03-01", 1)]
+        assert stored_runs(conn) == {("2024-02-28", "2024-03-01", 3)}
+        assert study_db.month_schedules(conn, 2024, 3) == [("2024-03-05", 1, "시험")]
+        assert conn.execute("SELECT title FROM memos").fetchall() == [("메모",)]
+        assert [r[1] for r in study_db.search(conn, "memos", "그냥")] == ["메모"]
+
+# =========================
+# ---- study_runs / 스트릭 ----
+# =========================
+@pytest.mark.parametrize("seed", range(3))
+def test_runs_follow_random_inserts_and_deletes(db, seed):
+    # 트리거로 이어 붙이고 쪼갠 구간 == 날짜 집합에서 다시 계산한 구간 == rebuild_runs 결과
+    rng = random.Random(seed)
+    with study_db.connection(db) as conn:
+        for _ in range(600):
+            day = (TODAY - timedelta(days=rng.randint(0, 60))).isoformat()
+            if rng.random() < 0.3:
+                with conn:
+                    conn.execute("DELETE FROM studytime WHERE date = ?", (day,))
+            else:
+                study_db.add_study_hours(conn, day, rng.randint(1, 3))
+            days = stored_days(conn)
+            expected = runs_from_dates(days)
+            assert stored_runs(conn) == expected
+            current, longest = study_db.streaks(conn, TODAY.isoformat())
+            assert current == study_db.current_streak(days, TODAY)
+            assert longest == max((n for _s, _e, n in expected), default=0)
+        study_db.rebuild_runs(conn)
+        assert stored_runs(conn) == runs_from_dates(stored_days(conn))
+
+def test_current_streak_ends_today_or_yesterday():
+    days = {TODAY - timedelta(days=n) for n in (1, 2, 3, 7)}
+    assert study_db.current_streak(days, TODAY) == 3
+    assert study_db.current_streak(days | {TODAY}, TODAY) == 4
+    assert study_db.current_streak(days, TODAY + timedelta(days=2)) == 0  # 구간이 끝난 지 오래
+    assert study_db.current_streak(set(), TODAY) == 0
+    assert [study_db.streak_level(n) for n in (0, 6, 7, 14, 21, 30, 100)] == [1, 1, 2, 3, 4, 5, 5]
+
+# =========================
+# ---- 연결 풀 ------------
+# =========================
+def test_pool_reuses_connections(db):
+    for _ in range(20):
+        with study_db.connection(db) as conn:
+            conn.execute("SELECT 1")
+    assert study_db.pool(db).opened == 1
+
+def test_pool_rolls_back_unfinished_transaction(db):
+    with pytest.raises(RuntimeError):
+        with study_db.connection(db) as conn:
+            conn.execute("INSERT INTO todos(task, done) VALUES('남으면 안 됨', 0)")
+            raise RuntimeError
+    with study_db.connection(db) as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0] == 0
@@ -0,0 +1,89 @@
+# study_store 저장소 3가지가 같은 계약을 지키는지 (메모리 / JSON lines / SQLite)
+import pytest
+
+import study_db
+import study_store
+from study_store import Backend, JsonLinesBackend, MemoryBackend, SqliteBackend, open_backend
+
+@pytest.fixture(params=["memory", "jsonl", "sqlite"])
+def kind(request):
+    return request.param
+
+@pytest.fixture
+def make(kind, tmp_path):
+    # 같은 자리를 가리키는 저장소를 새로 여는 함수 (다시 열어도 남아 있는지 볼 때)
+    opened = []
+
+    def make() -> Backend:
+        backend = {"memory": lambda: opened[0] if opened else MemoryBackend(),
+                   "jsonl": lambda: JsonLinesBackend(tmp_path / "data"),
+                   "sqlite": lambda: SqliteBackend(tmp_path / "store.db")}[kind]()
+        opened.append(backend)
+        return backend
+
+    yield make
+    study_db.close(tmp_path / "store.db")
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        Backend()
+
+def test_put_get_replace_delete(make):
+    store = make()
+    a = store.add("todos", task="수학", done=False)
+    b = store.put("todos", {"task": "영어", "done": False})  # id 없으면 새로 매김
+    assert a["id"] and b["id"] and a["id"] != b["id"]
+    assert store.get("todos", a["id"]) == a
+    store.put("todos", {**a, "done": True})
+    assert list(store.items("todos")) == [a["id"], b["id"]]  # 교체해도 순서는 그대로
+    assert store.get("todos", a["id"])["done"] is True
+    store.delete("todos", a["id"])
+    store.delete("todos", "없는 id")
+    assert store.get("todos", a["id"]) is None
+    assert list(store.items("todos").values()) == [b]
+
+def test_collections_are_separate(make):
+    store = make()
+    memo = store.add("memos", title="제목")
+    assert store.items("todos") == {}
+    assert store.get("todos", memo["id"]) is None
+    assert list(store.items("memos")) == [memo["id"]]
+
+def test_put_many_and_delete_many(make):
+    store = make()
+    items = store.put_many("books", [{"title": f"책 {i}"} for i in range(5)])
+    assert [x["title"] for x in store.items("books").values()] == [f"책 {i}" for i in range(5)]
+    store.put_many("books", [{**x, "title": x["title"] + "!"} for x in items[:2]])
+    store.delete_many("books", [x["id"] for x in items[3:]])
+    store.put_many("books", [])
+    store.delete_many("books", [])
+    assert [x["title"] for x in store.items("books").values()] == ["책 0!", "책 1!", "책 2"]
+
+def test_items_returns_a_copy(make):
+    store = make()
+    item = store.add("study", date="2024-03-01", hours=2)
+    store.items("study").clear()
+    assert store.get("study", item["id"]) == item
+
+def test_reopen_sees_writes(make):
+    first = make()
+    item = first.add("calendar", date="2024-03-01", content="시험")
+    first.put("calendar", {**item, "content": "시험 범위"})
+    assert make().items("calendar") == {item["id"]: {**item, "content": "시험 범위"}}
+
+def test_jsonl_compaction_keeps_items(tmp_path, monkeypatch):
+    monkeypatch.setattr(JsonLinesBackend, "COMPACT_MIN_LINES", 8)
+    store = JsonLinesBackend(tmp_path)
+    item = store.add("todos", task="a", n=0)
+    for n in range(1, 50):
+        store.put("todos", {**item, "n": n})
+    assert len((tmp_path / "todos.jsonl").read_text(encoding="utf-8").splitlines()) < 20
+    assert JsonLinesBackend(tmp_path).get("todos", item["id"])["n"] == 49
+
+def test_open_backend(tmp_path):
+    assert isinstance(open_backend("memory"), MemoryBackend)
+    assert isinstance(open_backend(f"jsonl:{tmp_path}"), JsonLinesBackend)
+    assert isinstance(open_backend(f"sqlite:{tmp_path / 'x.db'}"), SqliteBackend)
+    with pytest.raises(ValueError):
+        open_backend("redis:x")
+    assert set(study_store.COLLECTIONS) >= {"todos", "memos", "calendar", "books", "study"}
@@ -0,0 +1,38 @@
+# todo_sync: 사용자가 누른 체크박스만 쓰고, 누른 게 없으면 쓰기/커밋도 없음
+import sqlite3
+
+import pytest
+
+from todo_sync import PENDING_KEY, flush_done, record_toggle, take_toggles, todo_key
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE todos(id INTEGER PRIMARY KEY AUTOINCREMENT, task TEXT, done INTEGER)")
+    conn.executemany("INSERT INTO todos(task, done) VALUES(?, ?)", [(f"할 일 {i}", 0) for i in range(5)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def test_only_toggled_rows_are_written(conn):
+    writes = []
+    conn.set_trace_callback(lambda sql: sql.startswith("UPDATE") and writes.append(sql))
+    state = {todo_key(1): True, todo_key(2): False, todo_key(3): True}  # 2, 3 은 렌더만 됨
+    record_toggle(state, 1)
+    assert flush_done(conn, take_toggles(state)) == 1
+    assert len(writes) == 1
+    assert conn.execute("SELECT id FROM todos WHERE done = 1").fetchall() == [(1,)]
+    assert PENDING_KEY not in state
+
+def test_last_toggle_of_the_same_row_wins(conn):
+    state = {todo_key(4): True}
+    record_toggle(state, 4)
+    state[todo_key(4)] = False
+    record_toggle(state, 4)
+    assert take_toggles(state) == [(0, 4)]
+
+def test_nothing_toggled_means_no_write(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    assert flush_done(conn, take_toggles({})) == 0
+    assert statements == []
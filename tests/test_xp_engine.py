@@ -0,0 +1,101 @@
+# XPEngine 증분 계산이 매번 처음부터 다시 계산한 값과 같은지
+# 시드를 고정한 무작위 수정(추가/덮어쓰기/삭제, 날짜 넘김)으로 비교
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from logstore import LogStore
+from xp_engine import XPEngine
+
+HABITS = [{"name": "운동", "xp": 10}, {"name": "독서", "xp": 5}]
+XP_PER_MINUTE = 0.2
+TODAY = date(2024, 3, 1)
+
+def random_row(rng: random.Random, dstr: str) -> dict:
+    return {"date": dstr,
+            "study_minutes": rng.choice([0, 0, 10, 30, 95]),
+            "habits_completed": rng.choice([[], ["운동"], ["운동", "독서"], ["없는 습관"]])}
+
+def random_edit(rng: random.Random, logs: LogStore, start: date, days: int):
+    dstr = (start + timedelta(days=rng.randint(0, days))).isoformat()
+    if rng.random() < 0.25:
+        logs.delete(dstr)
+    else:
+        logs.upsert(random_row(rng, dstr))
+
+def full_xp(logs: LogStore, habits: list[dict], today: date) -> tuple[float, int, int, list]:
+    # (총 XP, 현재 스트릭, 마지막 활동 후 지난 날, 날짜별 누적 XP) 를 처음부터
+    lookup = {h["name"]: h["xp"] for h in habits}
+    total, cum, active = 0.0, [], set()
+    for row in logs:
+        total += row["study_minutes"] * XP_PER_MINUTE + sum(lookup.get(n, 0) for n in row["habits_completed"])
+        cum.append((row["date"], total))
+        if row["study_minutes"] > 0 or row["habits_completed"]:
+            active.add(date.fromisoformat(row["date"]))
+    streak, day = 0, today
+    while day in active:
+        streak += 1
+        day -= timedelta(days=1)
+    gap = (today - max(active)).days if active else 999
+    return total, streak, gap, cum
+
+def assert_engine_matches(engine: XPEngine, logs: LogStore, habits: list[dict], today: date):
+    total, streak, gap, cum = full_xp(logs, habits, today)
+    assert engine.total_xp == pytest.approx(total)
+    assert engine.current_streak(today) == streak
+    assert engine.days_since_activity(today) == gap
+    got = engine.xp_cum()
+    assert [d for d, _ in got] == [d for d, _ in cum]
+    assert [x for _, x in got] == pytest.approx([x for _, x in cum])
+
+@pytest.mark.parametrize("seed", range(3))
+def test_xp_engine_random_edits(seed):
+    rng = random.Random(seed)
+    logs = LogStore()
+    engine = XPEngine(logs, HABITS, XP_PER_MINUTE)
+    for _ in range(2000):
+        random_edit(rng, logs, TODAY - timedelta(days=40), 40)
+        if rng.random() < 0.3:
+            engine.xp_cum()  # 누적 캐시가 있는 상태에서의 증분 갱신도 거치게
+        assert_engine_matches(engine, logs, HABITS, TODAY)
+
+def test_xp_engine_deletes_inside_and_at_end_of_streak():
+    logs = LogStore()
+    engine = XPEngine(logs, HABITS, XP_PER_MINUTE)
+    for i in range(10):
+        logs.upsert({"date": (TODAY - timedelta(days=i)).isoformat(), "study_minutes": 30, "habits_completed": []})
+    assert engine.current_streak(TODAY) == 10
+    logs.delete((TODAY - timedelta(days=4)).isoformat())   # 구간 가운데
+    assert_engine_matches(engine, logs, HABITS, TODAY)
+    logs.delete(TODAY.isoformat())                          # 구간 끝
+    assert_engine_matches(engine, logs, HABITS, TODAY)
+    logs.upsert({"date": (TODAY - timedelta(days=4)).isoformat(), "study_minutes": 0, "habits_completed": []})
+    assert_engine_matches(engine, logs, HABITS, TODAY)      # 비활동 행으로 덮어쓰기
+    for dstr in [row["date"] for row in logs]:
+        logs.delete(dstr)
+    assert_engine_matches(engine, logs, HABITS, TODAY)
+    assert engine.total_xp == pytest.approx(0)
+
+def test_xp_engine_day_rollover():
+    rng = random.Random(7)
+    logs = LogStore()
+    engine = XPEngine(logs, HABITS, XP_PER_MINUTE)
+    today = TODAY
+    for _ in range(1500):
+        random_edit(rng, logs, today - timedelta(days=20), 21)
+        if rng.random() < 0.05:
+            today += timedelta(days=rng.choice([1, 1, 2, 30]))
+        # 같은 상태를 어제/오늘/내일 기준으로도 물어본다
+        for day in (today - timedelta(days=1), today, today + timedelta(days=1)):
+            assert_engine_matches(engine, logs, HABITS, day)
+
+def test_xp_engine_habit_xp_change_rebuilds():
+    rng = random.Random(3)
+    logs = LogStore()
+    engine = XPEngine(logs, HABITS, XP_PER_MINUTE)
+    for _ in range(300):
+        random_edit(rng, logs, TODAY - timedelta(days=30), 30)
+    changed = [{"name": "운동", "xp": 25}, {"name": "독서", "xp": 5}, {"name": "없는 습관", "xp": 1}]
+    engine.sync_habits(changed)
+    assert_engine_matches(engine, logs, changed, TODAY)
@@ -0,0 +1,93 @@
+# timers.py
+# 과목별 타이머 엔진 (app.py / last.py 공용)
+# 타이머 한 개 = 저장되는 dict:
+#   {id, title, subject, elapsed_sec: float, running: bool, started_at: epoch 초 | None}
+#  - 시작 시각은 벽시계(epoch)로 저장 → 서버 재시작/다른 세션에서도 이어서 흐름
+#  - 같은 프로세스 안에서는 time.monotonic() 기준으로 잰다 (시계 보정/변경에 영향 없음)
+#  - 저장할 때 분 단위로 떼어가고 남은 초는 그대로 남긴다 (1분 미만 버리지 않음)
+# 엔진은 프로세스에 하나(ENGINE)라서 여러 세션이 같은 기준 시각을 공유한다.
+import threading
+import time
+import uuid
+from datetime import datetime
+
+class TimerEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._anchors = {}  # id -> (started_at epoch, 그때의 monotonic 값)
+
+    def _anchor(self, t: dict) -> float:
+        # 이 타이머의 started_at 에 해당하는 monotonic 값
+        with self._lock:
+            anchor = self._anchors.get(t["id"])
+            if anchor is None or anchor[0] != t["started_at"]:
+                # 다른 프로세스/재시작 전에 시작된 타이머 → 벽시계 차이로 한 번만 맞춘다
+                mono = time.monotonic() - max(0.0, time.time() - t["started_at"])
+                anchor = self._anchors[t["id"]] = (t["started_at"], mono)
+            return anchor[1]
+
+    # ---- 조회 ----
+    def elapsed(self, t: dict) -> float:
+        elapsed = float(t.get("elapsed_sec", 0.0))
+        if t.get("running") and t.get("started_at"):
+            elapsed += time.monotonic() - self._anchor(t)
+        return elapsed
+
+    # ---- 조작 (바뀌었으면 True → 호출한 쪽에서 저장) ----
+    def start(self, t: dict) -> bool:
+        if t.get("running"):
+            return False
+        now = time.time()
+        t["running"] = True
+        t["started_at"] = now
+        with self._lock:
+            self._anchors[t["id"]] = (now, time.monotonic())
+        return True
+
+    def pause(self, t: dict) -> bool:
+        if not t.get("running"):
+            return False
+        t["elapsed_sec"] = self.elapsed(t)
+        t["running"] = False
+        t["started_at"] = None
+        self.forget(t["id"])
+        return True
+
+    def reset(self, t: dict):
+        t["elapsed_sec"] = 0.0
+        t["running"] = False
+        t["started_at"] = None
+        self.forget(t["id"])
+
+    def take_minutes(self, t: dict) -> int:
+        # 멈추고 분 단위만 떼어간다. 남은 초는 elapsed_sec 에 남음
+        self.pause(t)
+        minutes = int(t["elapsed_sec"] // 60)
+        t["elapsed_sec"] -= minutes * 60
+        return minutes
+
+    def forget(self, tid: str):
+        with self._lock:
+            self._anchors.pop(tid, None)
+
+ENGINE = TimerEngine()
+
+def new_timer(title: str, subject: str = "일반") -> dict:
+    return {"id": str(uuid.uuid4()), "title": title, "subject": subject,
+            "elapsed_sec": 0.0, "running": False, "started_at": None}
+
+def normalize(t: dict) -> dict:
+    # 예전 포맷 정리: last.py 의 {minutes, start_time: ISO}, app.py 의 {id,title,subject}
+    if "elapsed_sec" not in t:
+        t["elapsed_sec"] = float(t.pop("minutes", 0) or 0) * 60
+    if "started_at" not in t:
+        start = t.pop("start_time", None)
+        t["started_at"] = datetime.fromisoformat(start).timestamp() if isinstance(start, str) else start
+    t.setdefault("running", False)
+    t.setdefault("subject", "일반")
+    if not t["running"]:
+        t["started_at"] = None
+    return t
+
+def fmt_hms(seconds: float) -> str:
+    return f"{int(seconds // 3600):02d}:{int((seconds % 3600) // 60):02d}:{int(seconds % 60):02d}"
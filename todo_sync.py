@@ -0,0 +1,28 @@
+# todo_sync.py
+# dsghstudy_app ToDo 체크박스 저장
+# 예전에는 rerun 마다 모든 행에 UPDATE 를 날렸다 (할 일 수백 개면 클릭 한 번에 수백 번 쓰기).
+# 체크박스 on_change 콜백에서 사용자가 실제로 누른 것만 모아 두고, 다음 rerun 에
+# 그것만 한 트랜잭션(executemany)으로 쓴다. 위젯 상태를 DB 와 비교하지 않으므로
+# 오래 열어둔 탭이 아무것도 안 눌렀는데 다른 세션의 변경을 되돌리는 일이 없다.
+import sqlite3
+
+PENDING_KEY = "todo_toggles"
+
+def todo_key(row_id: int) -> str:
+    return f"todo_{row_id}"
+
+def record_toggle(state, row_id: int):
+    # 체크박스 on_change 콜백. state 는 st.session_state (테스트에서는 dict)
+    state.setdefault(PENDING_KEY, {})[row_id] = bool(state[todo_key(row_id)])
+
+def take_toggles(state) -> list[tuple[int, int]]:
+    # 모아 둔 토글을 비우고 executemany 에 바로 넣을 (done, id) 목록으로
+    return [(int(done), row_id) for row_id, done in state.pop(PENDING_KEY, {}).items()]
+
+def flush_done(conn: sqlite3.Connection, changes: list[tuple[int, int]]) -> int:
+    # 바뀐 게 없으면 쓰기/커밋 자체를 하지 않는다
+    if not changes:
+        return 0
+    with conn:
+        conn.executemany("UPDATE todos SET done=? WHERE id=?", changes)
+    return len(changes)
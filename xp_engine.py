@@ -0,0 +1,176 @@
+# xp_engine.py
+# XP / 레벨 / 스트릭 증분 계산기
+# 매 rerun 마다 DataFrame 을 새로 만들어 합계를 구하지 않고,
+# LogStore 에 구독해서 로그가 바뀔 때마다 그 하루치만 다시 계산한다.
+#  - 누적 XP, 날짜별 XP        : 로그 1건 변경당 O(1)
+#  - 날짜별 누적 XP(xp_cum)    : 마지막 날짜 변경은 O(1), 과거 날짜면 다음 조회 때 다시 계산
+#  - 현재 스트릭/마지막 활동일 : 보통 O(1) (과거 날짜를 고치면 해당 구간만 다시 셈)
+# 습관 XP 값이 바뀌었을 때만 전체를 다시 계산한다.
+#
+# habits_xp() 는 DataFrame 쪽(compute_xp) 에서 쓰는 벡터 버전:
+# habits_completed 리스트를 (행, 습관) 긴 표로 한 번 펼치고 XP 표와 join → 행별 합계.
+from datetime import date, timedelta
+from itertools import chain, repeat
+
+import numpy as np
+import pandas as pd
+
+from logstore import LogStore
+
+ONE_DAY = timedelta(days=1)
+
+def habit_signature(habits: list[dict]) -> tuple:
+    return tuple((h["name"], float(h.get("xp", 0))) for h in habits)
+
+def habits_xp(habits_completed: pd.Series, lookup: dict) -> pd.Series:
+    # lookup: 습관 이름 → XP (habit_xp_lookup 결과)
+    # 행마다 파이썬 lambda 를 돌리지 않는다:
+    #   1) 리스트들을 (행 번호, 습관) 긴 배열로 한 번 펼치고
+    #   2) 습관 이름 → XP 를 dict 해시 join (C 레벨 map)
+    #   3) 행 번호로 bincount = groupby(행).sum()
+    lists = habits_completed.to_numpy()
+    try:
+        lens = np.fromiter(map(len, lists), np.int64, len(lists))
+    except TypeError:
+        # None/NaN 이 섞인 경우만 정리
+        lists = [x if isinstance(x, list) else [] for x in lists]
+        lens = np.fromiter(map(len, lists), np.int64, len(lists))
+    flat = chain.from_iterable(lists)
+    prices = np.fromiter(map(lookup.get, flat, repeat(0.0)), float, int(lens.sum()))
+    rows = np.repeat(np.arange(len(lists)), lens)
+    return pd.Series(np.bincount(rows, weights=prices, minlength=len(lists)), index=habits_completed.index)
+
+class XPEngine:
+    def __init__(self, logs: LogStore, habits: list[dict], xp_per_minute: float):
+        self.logs = logs
+        self.xp_per_minute = xp_per_minute
+        self.habits_key = None
+        self.sync_habits(habits)
+        logs.subscribe(self.on_change)
+
+    # ---- 하루치 계산 ----
+    def _row_xp(self, row: dict) -> float:
+        minutes = int(row.get("study_minutes") or 0)
+        habits = row.get("habits_completed")
+        if not isinstance(habits, list):
+            habits = []
+        return minutes * self.xp_per_minute + sum(self.lookup.get(name, 0.0) for name in habits)
+
+    @staticmethod
+    def _is_active(row: dict) -> bool:
+        habits = row.get("habits_completed")
+        minutes = int(row.get("study_minutes") or 0)
+        return minutes > 0 or (isinstance(habits, list) and len(habits) > 0)
+
+    # ---- 전체 다시 계산 (습관 XP 변경 시) ----
+    def sync_habits(self, habits: list[dict]):
+        key = habit_signature(habits)
+        if key == self.habits_key:
+            return
+        self.habits_key = key
+        self.lookup = dict(key)
+        self.rebuild()
+
+    def rebuild(self):
+        self.day_xp = {}
+        self.total_xp = 0.0
+        self.active = set()
+        for row in self.logs:
+            xp = self._row_xp(row)
+            self.day_xp[row["date"]] = xp
+            self.total_xp += xp
+            if self._is_active(row):
+                self.active.add(date.fromisoformat(row["date"]))
+        self._cum = None
+        self._reset_run()
+
+    def _reset_run(self):
+        # 가장 최근 활동일에서 끝나는 연속 구간 [run_end - run_len + 1, run_end]
+        self.run_end = max(self.active) if self.active else None
+        self._recount_run()
+
+    def _recount_run(self):
+        self.run_len = 0
+        day = self.run_end
+        while day is not None and day in self.active:
+            self.run_len += 1
+            day -= ONE_DAY
+
+    # ---- 증분 갱신 ----
+    def on_change(self, dstr: str, row: dict | None):
+        old = self.day_xp.pop(dstr, 0.0)
+        new = 0.0
+        if row is not None:
+            new = self._row_xp(row)
+            self.day_xp[dstr] = new
+        self.total_xp += new - old
+
+        # 누적 XP: 마지막 날짜가 바뀌거나 새 날짜가 맨 뒤에 붙은 경우만 제자리에서 고친다
+        if self._cum is not None:
+            if row is not None and self._cum and self._cum[-1][0] == dstr:
+                prev = self._cum[-2][1] if len(self._cum) > 1 else 0.0
+                self._cum[-1] = (dstr, prev + new)
+            elif row is not None and (not self._cum or self._cum[-1][0] < dstr):
+                prev = self._cum[-1][1] if self._cum else 0.0
+                self._cum.append((dstr, prev + new))
+            else:
+                self._cum = None
+
+        d = date.fromisoformat(dstr)
+        if row is not None and self._is_active(row):
+            self._activate(d)
+        else:
+            self._deactivate(d)
+
+    def _activate(self, d: date):
+        if d in self.active:
+            return
+        self.active.add(d)
+        if self.run_end is None or d > self.run_end + ONE_DAY:
+            self.run_end, self.run_len = d, 1
+        elif d == self.run_end + ONE_DAY:
+            self.run_end, self.run_len = d, self.run_len + 1
+        elif d == self.run_end - self.run_len * ONE_DAY:
+            # 구간 바로 앞날이 채워짐 → 더 앞 구간과 이어질 수 있어서 다시 셈
+            self._recount_run()
+
+    def _deactivate(self, d: date):
+        if d not in self.active:
+            return
+        self.active.discard(d)
+        if d == self.run_end:
+            self._reset_run()
+        elif self.run_end - self.run_len * ONE_DAY < d < self.run_end:
+            self.run_len = (self.run_end - d).days
+
+    # ---- 조회 ----
+    def current_streak(self, today: date | None = None) -> int:
+        today = today or date.today()
+        if self.run_end is None or self.run_end < today:
+            return 0
+        if self.run_end == today:
+            return self.run_len
+        # 오늘 뒤 날짜에도 기록이 있으면 (가져오기 등) 예전처럼 오늘부터 거꾸로 센다
+        streak, day = 0, today
+        while day in self.active:
+            streak += 1
+            day -= ONE_DAY
+        return streak
+
+    def last_active(self) -> date | None:
+        return self.run_end
+
+    def days_since_activity(self, today: date | None = None) -> int:
+        if self.run_end is None:
+            return 999
+        return ((today or date.today()) - self.run_end).days
+
+    def xp_cum(self) -> list[tuple[str, float]]:
+        # [(date, 누적 XP), ...] 날짜순
+        if self._cum is None:
+            acc = 0.0
+            self._cum = []
+            for row in self.logs:
+                acc += self.day_xp[row["date"]]
+                self._cum.append((row["date"], acc))
+        return self._cum